@@ -8,9 +8,21 @@ import logging
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
+from homeassistant.helpers.storage import Store
 
 from .coordinator import VisonicAlarmCoordinator
-from .const import CONF_PANEL_ID, DATA, DOMAIN, UPDATE_LISTENER, VISONIC_PLATFORMS
+from .const import (
+    BENCHMARK_STORE_VERSION,
+    CONF_PANEL_ID,
+    DATA,
+    DOMAIN,
+    SESSION_STORE_VERSION,
+    UPDATE_LISTENER,
+    VISONIC_PLATFORMS,
+)
+from .scheduler import async_get_scheduler
+from .services import async_setup_services, async_unload_services
+from .websocket import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,10 +33,17 @@ async def async_setup_entry(hass, config_entry):
 
     coordinator = VisonicAlarmCoordinator(hass, config_entry)
 
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
 
-    if not await coordinator.validate_logged_in():
-        raise ConfigEntryNotReady
+        if not await coordinator.validate_logged_in():
+            raise ConfigEntryNotReady
+    except Exception:
+        coordinator.executor.shutdown()
+        raise
+
+    # Poll with all other panels via the shared scheduler
+    async_get_scheduler(hass).async_add(coordinator)
 
     # Update listener for config option changes
     update_listener = config_entry.add_update_listener(_async_update_listener)
@@ -42,7 +61,8 @@ async def async_setup_entry(hass, config_entry):
     await hass.config_entries.async_forward_entry_setups(config_entry, VISONIC_PLATFORMS)
 
     # Setup services
-    # await async_setup_services(hass, coordinator)
+    await async_setup_services(hass)
+    async_setup_websocket(hass)
 
     # Add hub as device
     await async_update_device_registry(hass, config_entry)
@@ -81,6 +101,12 @@ async def async_remove_config_entry_device(hass, config_entry, device_entry) ->
     return True
 
 
+async def async_remove_entry(hass, config_entry):
+    """Remove stored session and benchmark baseline when config entry is removed."""
+    await Store(hass, SESSION_STORE_VERSION, f"{DOMAIN}.{config_entry.entry_id}.session").async_remove()
+    await Store(hass, BENCHMARK_STORE_VERSION, f"{DOMAIN}.{config_entry.entry_id}.benchmark").async_remove()
+
+
 async def async_unload_entry(hass, config_entry):
     """Unload a config entry"""
     _LOGGER.debug("Unload Visonic integration platforms")
@@ -93,6 +119,12 @@ async def async_unload_entry(hass, config_entry):
 
     _LOGGER.debug("Unload integration")
     if unload_ok:
-        hass.data[DOMAIN].pop(config_entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(config_entry.entry_id)[DATA]
+        async_get_scheduler(hass).async_remove(coordinator)
+        coordinator.async_cancel_delay_check()
+        coordinator.async_cancel_probe()
+        await coordinator.profiler.async_stop()
+        coordinator.executor.shutdown()
+        await async_unload_services(hass)
 
     return unload_ok
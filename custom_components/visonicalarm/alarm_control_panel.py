@@ -1,8 +1,9 @@
 """
 Interfaces with the Visonic Alarm control panel.
 """
-import asyncio
 import logging
+import time
+from typing import Callable
 
 from homeassistant.components.alarm_control_panel import AlarmControlPanelEntity
 from homeassistant.components.alarm_control_panel.const import AlarmControlPanelEntityFeature, CodeFormat
@@ -20,7 +21,7 @@ from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DATA, DOMAIN
+from .const import ALARM_PANELS, ATTR_DELAY_ENDS, DATA, DOMAIN
 from .entity import BaseVisonicEntity
 
 SUPPORT_VISONIC = (
@@ -46,9 +47,14 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the Visonic Alarm platform."""
     alarms = []
     coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA]
+    start = time.perf_counter()
     for partition in coordinator.status.partitions:
         alarms.append(DSCAlarm(coordinator, hass, partition.id))
+
+    # Keep a reference by partition for the multi-partition services
+    hass.data[DOMAIN][config_entry.entry_id][ALARM_PANELS] = {alarm.partition_id: alarm for alarm in alarms}
     async_add_entities(alarms)
+    coordinator.metrics.record_entity_setup("alarm_control_panel", len(alarms), start)
 
 
 class AlarmAction:
@@ -75,9 +81,19 @@ class AlarmState:
     HOME = "STAY"
 
 
+ACTION_TARGET_STATE = {
+    AlarmAction.DISARM: AlarmState.DISARM,
+    AlarmAction.ARM_HOME: AlarmState.HOME,
+    AlarmAction.ARM_AWAY: AlarmState.AWAY,
+}
+
+
 class DSCAlarm(BaseVisonicEntity, AlarmControlPanelEntity, CoordinatorEntity):
     """Representation of a Visonic Alarm control panel."""
 
+    # Poll metadata and delay countdown must never be recorded with the panel state
+    _unrecorded_attributes = frozenset({ATTR_SYSTEM_LAST_UPDATE, ATTR_DELAY_ENDS})
+
     def __init__(self, coordinator, hass, partition_id: int):
         """Initialize the Visonic Alarm panel."""
         super().__init__(coordinator)
@@ -105,6 +121,11 @@ class DSCAlarm(BaseVisonicEntity, AlarmControlPanelEntity, CoordinatorEntity):
         """Return unique id."""
         return f"{DOMAIN}-{self.coordinator.panel_info.serial}-{self._partition_id}-panel"
 
+    @property
+    def partition_id(self) -> int:
+        """Return partition id."""
+        return self._partition_id
+
     @property
     def extra_state_attributes(self):
         """Return the state attributes of the alarm system."""
@@ -112,9 +133,12 @@ class DSCAlarm(BaseVisonicEntity, AlarmControlPanelEntity, CoordinatorEntity):
         attrs[ATTR_SYSTEM_SERIAL_NUMBER] = self.coordinator.panel_info.serial
         attrs[ATTR_SYSTEM_MODEL] = self.coordinator.panel_info.model
         attrs[ATTR_SYSTEM_READY] = self._partition_status.ready
+        if delay := self.coordinator.partition_delays.get(self._partition_id):
+            # Only the end is given, as polls pause during a delay and a frontend can count down to it
+            attrs[ATTR_DELAY_ENDS] = delay.ends_at.isoformat()
         # ATTR_SYSTEM_CONNECTED: self._alarm.connected(),
         # ATTR_SYSTEM_SESSION_TOKEN: self._alarm.session_token,
-        attrs[ATTR_SYSTEM_LAST_UPDATE] = self.coordinator.last_update
+        # ATTR_SYSTEM_LAST_UPDATE is provided by the last update diagnostic sensor
         # ATTR_CODE_FORMAT: self.code_format,
         # ATTR_CHANGED_BY: self.changed_by,
         # ATTR_CHANGED_TIMESTAMP: self._changed_timestamp,
@@ -158,13 +182,6 @@ class DSCAlarm(BaseVisonicEntity, AlarmControlPanelEntity, CoordinatorEntity):
         """Return the last change triggered by."""
         return self._changed_timestamp
 
-    async def async_force_update(self, delay: int = 0):
-        """Force update from api"""
-        _LOGGER.debug("Alarm update initiated by %s", self.name)
-        if delay:
-            await asyncio.sleep(delay)
-        await self.coordinator.async_refresh()
-
     @callback
     def _handle_coordinator_update(self) -> None:
         self._partition = self.coordinator.get_partition_info_by_id(self._partition_id)
@@ -204,6 +221,15 @@ class DSCAlarm(BaseVisonicEntity, AlarmControlPanelEntity, CoordinatorEntity):
             elif state == AlarmStatus.ALARM:
                 return STATE_ALARM_TRIGGERED
             
+    def partition_in_state(self, target_state: str) -> Callable[[], bool]:
+        """Return function to confirm partition has reached target state."""
+
+        def confirm() -> bool:
+            partition_status = self.coordinator.get_partition_status_by_id(self._partition_id)
+            return bool(partition_status and partition_status.state == target_state)
+
+        return confirm
+
     @property
     def code_arm_required(self):
         return False
@@ -218,27 +244,22 @@ class DSCAlarm(BaseVisonicEntity, AlarmControlPanelEntity, CoordinatorEntity):
         if (not self._arm_in_progress) and (self.coordinator.pin_required_disarm and code != self._code):
             raise HomeAssistantError("Pin is required to disarm this alarm but no pin was provided")
         else:
-            _LOGGER.debug("Disarming alarm...")
-
-            process_token = await self.hass.async_add_executor_job(self._alarm.disarm, self._partition_id)
-            self._disarm_in_progress = True
-            self._state = STATE_ALARM_DISARMING
-            self.async_write_ha_state()
-
-            if await self.async_wait_for_process_success(self.coordinator, process_token):
-                _LOGGER.debug("Disarming alarm completed successfully")
-                self._disarm_in_progress = False
-                await self.async_force_update()
-            else:
-                _LOGGER.error("Disarming alarm did not complete successfully.")
+            with self.trace_command(f"command.{AlarmAction.DISARM}"):
+                await self.async_execute_action(AlarmAction.DISARM)
 
     async def async_alarm_arm_home(self, code=None):
         """Send arm home command."""
-        await self.async_alarm_arm(AlarmAction.ARM_HOME, code)
+        with self.trace_command(f"command.{AlarmAction.ARM_HOME}"):
+            await self.async_alarm_arm(AlarmAction.ARM_HOME, code)
 
     async def async_alarm_arm_away(self, code=None):
         """Send arm away command."""
-        await self.async_alarm_arm(AlarmAction.ARM_AWAY, code)
+        with self.trace_command(f"command.{AlarmAction.ARM_AWAY}"):
+            await self.async_alarm_arm(AlarmAction.ARM_AWAY, code)
+
+    def trace_command(self, name: str):
+        """Return span of a command lifecycle.  Commands are always traced."""
+        return self.coordinator.tracer.span(name, "command", root_sample_rate=1, partition=self._partition_id)
 
     async def async_alarm_arm(self, action: AlarmAction, code):
         """Arm Alarm"""
@@ -247,32 +268,12 @@ class DSCAlarm(BaseVisonicEntity, AlarmControlPanelEntity, CoordinatorEntity):
         else:
             _LOGGER.debug("Arming alarm...")
 
-            # Get current status of partition
-            await self.coordinator.async_update_status()
+            # Get current status of partition if not recently updated
+            await self.coordinator.async_update_status(max_age=self.coordinator.status_max_age)
             if self.get_partition_ready(self._partition_id):
                 try:
-                    if action == AlarmAction.ARM_HOME:
-                        process_token = await self.hass.async_add_executor_job(
-                            self._alarm.arm_home, self._partition_id
-                        )
-                    elif action == AlarmAction.ARM_AWAY:
-                        process_token = await self.hass.async_add_executor_job(
-                            self._alarm.arm_away, self._partition_id
-                        )
-
-                    self._arm_in_progress = True
-                    self._state = STATE_ALARM_ARMING
-                    self.async_write_ha_state()
-
-                    result = await self.async_wait_for_process_success(self.coordinator, process_token)
-                    self._arm_in_progress = False
-                    await self.async_force_update()
-                    if result:
-                        _LOGGER.debug("Arming alarm completed successfully")
-                    else:
-                        _LOGGER.error("%s did not complete successfully.", action)
+                    if not await self.async_execute_action(action):
                         raise HomeAssistantError("There was an error setting the alarm")
-
                 except HomeAssistantError:
                     pass
                 except Exception as ex:
@@ -282,3 +283,58 @@ class DSCAlarm(BaseVisonicEntity, AlarmControlPanelEntity, CoordinatorEntity):
                 raise HomeAssistantError(
                     "The alarm system is not in a ready state. Maybe there are doors or windows open?"
                 )
+
+    async def async_execute_action(self, action: AlarmAction, refresh: bool = True) -> bool:
+        """Send action command and wait for it to complete.
+
+        Pin and ready checks are the responsibility of the caller.  Set refresh
+        to False when the caller will refresh the coordinator itself, such as
+        when actioning several partitions together.
+        """
+        with self.trace_command(f"execute.{action}"):
+            return await self._async_execute_action(action, refresh)
+
+    async def _async_execute_action(self, action: AlarmAction, refresh: bool) -> bool:
+        """Send action command and wait for it to complete."""
+        process_token = await self.async_send_action(action)
+        result = await self.async_wait_for_process_success(
+            self.coordinator, process_token, self.partition_in_state(ACTION_TARGET_STATE[action])
+        )
+        self.async_action_completed(action, result)
+        if refresh and (result or action != AlarmAction.DISARM):
+            await self.async_force_update(status_only=True)
+        return bool(result)
+
+    async def async_send_action(self, action: AlarmAction) -> str:
+        """Send action command, show it in progress and return its process token."""
+        if action == AlarmAction.DISARM:
+            _LOGGER.debug("Disarming alarm...")
+            process_token = await self.coordinator.async_add_job(self._alarm.disarm, self._partition_id)
+            self._disarm_in_progress = True
+            self._state = STATE_ALARM_DISARMING
+        else:
+            if action == AlarmAction.ARM_HOME:
+                process_token = await self.coordinator.async_add_job(self._alarm.arm_home, self._partition_id)
+            elif action == AlarmAction.ARM_AWAY:
+                process_token = await self.coordinator.async_add_job(self._alarm.arm_away, self._partition_id)
+            self._arm_in_progress = True
+            self._state = STATE_ALARM_ARMING
+        self.async_write_ha_state()
+        return process_token
+
+    @callback
+    def async_action_completed(self, action: AlarmAction, result: bool):
+        """Clear in progress state once the action's process has completed."""
+        if action == AlarmAction.DISARM:
+            if result:
+                _LOGGER.debug("Disarming alarm completed successfully")
+                self._disarm_in_progress = False
+            else:
+                _LOGGER.error("Disarming alarm did not complete successfully.")
+            return
+
+        self._arm_in_progress = False
+        if result:
+            _LOGGER.debug("Arming alarm completed successfully")
+        else:
+            _LOGGER.error("%s did not complete successfully.", action)
@@ -0,0 +1,146 @@
+"""Micro-benchmarks of per-refresh entity hot paths"""
+
+from __future__ import annotations
+
+import logging
+import timeit
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .alarm_control_panel import DSCAlarm
+from .const import ALARM_PANELS, BENCHMARK_DEVICE_COUNTS, BENCHMARK_STORE_VERSION, DOMAIN, SUPPORTED_SENSORS
+from .coordinator import VisonicAlarmCoordinator
+from .diagnostics import to_json
+from .sensor import VisonicAlarmSensor
+
+if TYPE_CHECKING:
+    from pyvisonicalarm.devices import Device as VisonicDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+READING_DATE = "2024-01-01T12:00:00"
+
+
+def scale_devices(devices: list[VisonicDevice], count: int) -> list[VisonicDevice]:
+    """Return count devices copied round robin from the panel's own devices.
+
+    Only devices sensors are created for are copied, as only they have names.
+    """
+    supported = [device for device in devices or [] if device.subtype in SUPPORTED_SENSORS]
+    zones = [device for device in supported if device.device_type != "CONTROL_PANEL"] or supported
+    if not zones:
+        raise HomeAssistantError("Panel has no supported devices to benchmark")
+    scaled = []
+    for index in range(count):
+        device = zones[index % len(zones)]
+        data = {**device._data, "id": index + 1, "device_number": index + 1}  # pylint: disable=protected-access
+        scaled.append(type(device)(data))
+    return scaled
+
+
+def time_call(func: Callable[[], None]) -> float:
+    """Return best seconds per call of func."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def run_benchmarks(coordinator: VisonicAlarmCoordinator, alarms: list[DSCAlarm]) -> dict[str, dict[str, float]]:
+    """Time hot paths against the panel's data scaled to several device counts.
+
+    Blocking, so run in the executor.  Results are seconds per call keyed by
+    benchmark then device count.
+    """
+    results: dict[str, dict[str, float]] = {}
+
+    def record(name: str, devices: int | str, func: Callable[[], None]):
+        results.setdefault(name, {})[str(devices)] = time_call(func)
+
+    for alarm in alarms[:1]:
+        partition_status = coordinator.get_partition_status_by_id(alarm.partition_id)
+        record("get_partition_state", "panel", lambda: alarm.get_partition_state(partition_status))
+        record("code_format", "panel", lambda: alarm.code_format)
+
+    for count in BENCHMARK_DEVICE_COUNTS:
+        devices = scale_devices(coordinator.devices, count)
+        sensors = [VisonicAlarmSensor(coordinator, device, "state") for device in devices]
+        # Lookups against scaled data without touching the live coordinator
+        lookup = SimpleNamespace(devices=devices, status=coordinator.status, panel_info=coordinator.panel_info)
+        partition_id = coordinator.status.partitions[-1].id
+
+        record("get_base_name", count, lambda: [VisonicAlarmSensor.get_base_name(device) for device in devices])
+        record("device_info", count, lambda: [sensor.device_info for sensor in sensors])
+        record(
+            "convert_to_local_datetime",
+            count,
+            lambda: [sensor.convert_to_local_datetime(READING_DATE) for sensor in sensors],
+        )
+        record("get_attrs", count, lambda: [sensor.extra_state_attributes for sensor in sensors])
+        record("get_device_by_id", count, lambda: VisonicAlarmCoordinator.get_device_by_id(lookup, count))
+        record(
+            "get_partition_status_by_id",
+            count,
+            lambda: VisonicAlarmCoordinator.get_partition_status_by_id(lookup, partition_id),
+        )
+        record(
+            "get_partition_info_by_id",
+            count,
+            lambda: VisonicAlarmCoordinator.get_partition_info_by_id(lookup, partition_id),
+        )
+        record("to_json", count, lambda: [to_json(device) for device in devices])
+
+    return results
+
+
+def get_regressions(baseline: dict, results: dict, threshold: float) -> list[dict]:
+    """Return benchmarks slower than their baseline by more than threshold percent."""
+    regressions = []
+    for name, counts in results.items():
+        for devices, result in counts.items():
+            if not (base := baseline.get(name, {}).get(devices)):
+                continue
+            slower_by = (result - base) * 100 / base
+            if slower_by > threshold:
+                regressions.append(
+                    {
+                        "name": name,
+                        "devices": devices,
+                        "baseline": base,
+                        "result": result,
+                        "slower_by": round(slower_by, 1),
+                    }
+                )
+    return regressions
+
+
+async def async_benchmark(
+    coordinator: VisonicAlarmCoordinator, save_baseline: bool = False, threshold: float = 0
+) -> dict:
+    """Run benchmarks and compare with, or save, the stored baseline."""
+    hass = coordinator.hass
+    alarms = list(hass.data[DOMAIN][coordinator.config_entry.entry_id].get(ALARM_PANELS, {}).values())
+    results = await hass.async_add_executor_job(run_benchmarks, coordinator, alarms)
+
+    store = Store(hass, BENCHMARK_STORE_VERSION, f"{DOMAIN}.{coordinator.config_entry.entry_id}.benchmark")
+    baseline = await store.async_load() or {}
+    regressions = get_regressions(baseline, results, threshold)
+
+    if save_baseline:
+        await store.async_save(results)
+    for regression in regressions:
+        _LOGGER.warning(
+            "%s with %s devices is %s%% slower than baseline",
+            regression["name"],
+            regression["devices"],
+            regression["slower_by"],
+        )
+
+    return {
+        "panel": coordinator.config_entry.title,
+        "results": results,
+        "baseline_saved": save_baseline,
+        "regressions": regressions,
+    }
@@ -4,6 +4,7 @@ Config Flow for Visonic Alarm.
 """
 import logging
 import uuid
+from functools import partial
 
 import voluptuous as vol
 from homeassistant import config_entries
@@ -11,10 +12,54 @@ from homeassistant.const import CONF_CODE, CONF_EMAIL, CONF_HOST, CONF_PASSWORD,
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.selector import selector
-from pyvisonicalarm import alarm as VisonicAlarm
 from pyvisonicalarm.exceptions import LoginTemporaryBlockedError
 
-from .const import CONF_PANEL_ID, CONF_PIN_REQUIRED_ARM, CONF_PIN_REQUIRED_DISARM, DEFAUL_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CONF_ENTRY_DELAY,
+    CONF_EVENT_HISTORY_SIZE,
+    CONF_EXECUTOR_QUEUE,
+    CONF_EXECUTOR_WORKERS,
+    CONF_EXIT_DELAY,
+    CONF_HOSTS,
+    CONF_LUX_DEADBAND,
+    CONF_MAX_SUPPRESS_INTERVAL,
+    CONF_PANEL_ID,
+    CONF_PIN_REQUIRED_ARM,
+    CONF_PIN_REQUIRED_DISARM,
+    CONF_REPLAY_SPEED,
+    CONF_STALE_FAILURES,
+    CONF_STALE_MAX_AGE,
+    CONF_STATISTICS_SENSORS,
+    CONF_STATISTICS_WINDOW,
+    CONF_STATUS_MAX_AGE,
+    CONF_SUMMARY_SENSORS,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TRACE_SAMPLE_RATE,
+    CONF_TRANSPORT,
+    CONF_ZONE_ENTITIES,
+    DEFAULT_ENTRY_DELAY,
+    DEFAULT_EVENT_HISTORY_SIZE,
+    DEFAULT_EXECUTOR_QUEUE,
+    DEFAULT_EXECUTOR_WORKERS,
+    DEFAULT_LUX_DEADBAND,
+    DEFAULT_MAX_SUPPRESS_INTERVAL,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_STALE_FAILURES,
+    DEFAULT_STALE_MAX_AGE,
+    DEFAULT_STATISTICS_WINDOW,
+    DEFAULT_STATUS_MAX_AGE,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TRACE_SAMPLE_RATE,
+    DEFAUL_SCAN_INTERVAL,
+    DOMAIN,
+    TRANSPORT_LIVE,
+    TRANSPORT_RECORD,
+    TRANSPORT_REPLAY,
+    ZONE_ENTITY_CLASSES,
+)
+from .hosts import is_host_error, parse_hosts
+from .loader import async_import_api
+from .login import async_get_login_governor
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,7 +92,7 @@ class VisonicAlarmFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self.discovery_info = {}
         self.user_session = None
         self.user_pass = {}
-        self.alarm: VisonicAlarm = None
+        self.alarm = None
 
     @staticmethod
     @callback
@@ -59,27 +104,43 @@ class VisonicAlarmFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Validate the user input allows us to connect.
         Data has the keys from DATA_SCHEMA with values provided by the user.
         """
-        self.alarm = VisonicAlarm.Setup(
-            data[CONF_HOST],
-            data[CONF_UUID],
-        )
+        visonic_alarm = await async_import_api(self.hass)
+        hosts = parse_hosts(data[CONF_HOST])
+        if not hosts:
+            raise ValueError("No host given")
 
-        try:
-            user_token = await self.hass.async_add_executor_job(
-                self.alarm.authenticate,
-                data[CONF_EMAIL],
-                data[CONF_PASSWORD],
+        # Hosts are tried in order, moving on only if a host cannot be reached
+        for host in hosts:
+            self.alarm = visonic_alarm.Setup(
+                host,
+                data[CONF_UUID],
             )
-            return user_token
-        except Exception as ex:
-            raise Exception(  # pylint: disable=broad-exception-raised
-                msg=("Alarm cannot connect. Error is %s", str(ex))
-            ) from ex
+
+            try:
+                user_token = await async_get_login_governor(self.hass).async_login(
+                    data[CONF_EMAIL],
+                    f"flow-{data[CONF_EMAIL]}",
+                    partial(
+                        self.hass.async_add_executor_job, self.alarm.authenticate, data[CONF_EMAIL], data[CONF_PASSWORD]
+                    ),
+                )
+                return user_token
+            except LoginTemporaryBlockedError:
+                raise
+            except Exception as ex:
+                if host != hosts[-1] and is_host_error(ex):
+                    _LOGGER.warning("Unable to connect to %s, trying next host.  Error is %s", host, ex)
+                    continue
+                raise Exception(  # pylint: disable=broad-exception-raised
+                    msg=("Alarm cannot connect. Error is %s", str(ex))
+                ) from ex
 
     async def validate_panel_login(self, data):
         """Validate log in to panel."""
-        session_token = await self.hass.async_add_executor_job(
-            self.alarm.panel_login, data[CONF_PANEL_ID], data[CONF_CODE]
+        session_token = await async_get_login_governor(self.hass).async_login(
+            self.user_pass[CONF_EMAIL],
+            f"flow-{self.user_pass[CONF_EMAIL]}-{data[CONF_PANEL_ID]}",
+            partial(self.hass.async_add_executor_job, self.alarm.panel_login, data[CONF_PANEL_ID], data[CONF_CODE]),
         )
         return session_token
 
@@ -169,6 +230,10 @@ class VisonicAlarmOptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_create_entry(title="", data=options)
 
         data_schema = {
+            vol.Required(
+                CONF_HOSTS,
+                default=self.config_entry.options.get(CONF_HOSTS, self.config_entry.data[CONF_HOST]),
+            ): str,
             vol.Required(
                 CONF_SCAN_INTERVAL,
                 default=self.config_entry.options.get(CONF_SCAN_INTERVAL, DEFAUL_SCAN_INTERVAL),
@@ -183,6 +248,227 @@ class VisonicAlarmOptionsFlowHandler(config_entries.OptionsFlow):
                     }
                 }
             ),
+            vol.Required(
+                CONF_STATUS_MAX_AGE,
+                default=self.config_entry.options.get(CONF_STATUS_MAX_AGE, DEFAULT_STATUS_MAX_AGE),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 60,
+                        "step": 1,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_EXIT_DELAY,
+                default=self.config_entry.options.get(CONF_EXIT_DELAY, 0),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 255,
+                        "step": 1,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_ENTRY_DELAY,
+                default=self.config_entry.options.get(CONF_ENTRY_DELAY, DEFAULT_ENTRY_DELAY),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 255,
+                        "step": 1,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_STALE_FAILURES,
+                default=self.config_entry.options.get(CONF_STALE_FAILURES, DEFAULT_STALE_FAILURES),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 20,
+                        "step": 1,
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_STALE_MAX_AGE,
+                default=self.config_entry.options.get(CONF_STALE_MAX_AGE, DEFAULT_STALE_MAX_AGE),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 3600,
+                        "step": 10,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_TEMPERATURE_DEADBAND,
+                default=self.config_entry.options.get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 5,
+                        "step": 0.1,
+                        "unit_of_measurement": "°C",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_LUX_DEADBAND,
+                default=self.config_entry.options.get(CONF_LUX_DEADBAND, DEFAULT_LUX_DEADBAND),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 100,
+                        "step": 1,
+                        "unit_of_measurement": "%",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_MAX_SUPPRESS_INTERVAL,
+                default=self.config_entry.options.get(CONF_MAX_SUPPRESS_INTERVAL, DEFAULT_MAX_SUPPRESS_INTERVAL),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 3600,
+                        "step": 1,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_EXECUTOR_WORKERS,
+                default=self.config_entry.options.get(CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS),
+            ): selector(
+                {
+                    "number": {
+                        "min": 1,
+                        "max": 8,
+                        "step": 1,
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_EXECUTOR_QUEUE,
+                default=self.config_entry.options.get(CONF_EXECUTOR_QUEUE, DEFAULT_EXECUTOR_QUEUE),
+            ): selector(
+                {
+                    "number": {
+                        "min": 1,
+                        "max": 100,
+                        "step": 1,
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_EVENT_HISTORY_SIZE,
+                default=self.config_entry.options.get(CONF_EVENT_HISTORY_SIZE, DEFAULT_EVENT_HISTORY_SIZE),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 5000,
+                        "step": 50,
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_TRANSPORT,
+                default=self.config_entry.options.get(CONF_TRANSPORT, TRANSPORT_LIVE),
+            ): selector(
+                {
+                    "select": {
+                        "options": [TRANSPORT_LIVE, TRANSPORT_RECORD, TRANSPORT_REPLAY],
+                        "translation_key": "transport",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_REPLAY_SPEED,
+                default=self.config_entry.options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 100,
+                        "step": 0.5,
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_SUMMARY_SENSORS,
+                default=self.config_entry.options.get(CONF_SUMMARY_SENSORS, False),
+            ): bool,
+            vol.Required(
+                CONF_ZONE_ENTITIES,
+                default=self.config_entry.options.get(CONF_ZONE_ENTITIES, ZONE_ENTITY_CLASSES),
+            ): selector(
+                {
+                    "select": {
+                        "options": ZONE_ENTITY_CLASSES,
+                        "multiple": True,
+                        "translation_key": "zone_entities",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_STATISTICS_WINDOW,
+                default=self.config_entry.options.get(CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 1440,
+                        "step": 5,
+                        "unit_of_measurement": "min",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                CONF_STATISTICS_SENSORS,
+                default=self.config_entry.options.get(CONF_STATISTICS_SENSORS, False),
+            ): bool,
+            vol.Required(
+                CONF_TRACE_SAMPLE_RATE,
+                default=self.config_entry.options.get(CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 1,
+                        "step": 0.05,
+                        "mode": "box",
+                    }
+                }
+            ),
             vol.Required(
                 CONF_PIN_REQUIRED_ARM,
                 default=self.config_entry.options.get(CONF_PIN_REQUIRED_ARM, True),
@@ -2,14 +2,183 @@ DOMAIN = "visonicalarm"
 CONF_PANEL_ID = "panel_id"
 CONF_PIN_REQUIRED_ARM = "pin_required_arm"
 CONF_PIN_REQUIRED_DISARM = "pin_required_disarm"
+CONF_STATUS_MAX_AGE = "status_max_age"
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_LUX_DEADBAND = "lux_deadband"
+CONF_MAX_SUPPRESS_INTERVAL = "max_suppress_interval"
+CONF_EXECUTOR_WORKERS = "executor_workers"
+CONF_EXECUTOR_QUEUE = "executor_queue"
+CONF_EVENT_HISTORY_SIZE = "event_history_size"
+CONF_TRANSPORT = "transport"
+CONF_SUMMARY_SENSORS = "summary_sensors"
+CONF_ZONE_ENTITIES = "zone_entities"
+CONF_REPLAY_SPEED = "replay_speed"
+CONF_STATISTICS_WINDOW = "statistics_window"
+CONF_STATISTICS_SENSORS = "statistics_sensors"
+CONF_STALE_FAILURES = "stale_failures"
+CONF_STALE_MAX_AGE = "stale_max_age"
+CONF_TRACE_SAMPLE_RATE = "trace_sample_rate"
+CONF_EXIT_DELAY = "exit_delay"
+CONF_ENTRY_DELAY = "entry_delay"
+CONF_HOSTS = "hosts"
 
 PROCESS_TIMEOUT = 60
+PROCESS_POLL_INTERVAL = 2
+REFRESH_DEBOUNCE = 0.5
+REFRESH_BUDGET = 45
+
+# Exit and entry delays are counted down locally and status checked just after they should end
+STATUS_EXIT = "EXIT"
+STATUS_ENTRY_DELAY = "ENTRYDELAY"
+DEFAULT_EXIT_DELAY = 30
+DEFAULT_ENTRY_DELAY = 30
+DELAY_CHECK_MARGIN = 2
+DELAY_RECHECK_INTERVAL = 5
+DELAY_MAX_OVERRUN = 60
+
+# Seconds an api call may take before it is abandoned
+DEFAULT_API_DEADLINE = 10
+API_DEADLINES = {
+    "authenticate": 15,
+    "panel_login": 15,
+    "get_devices": 15,
+    "get_events": 15,
+    "get_process_status": 8,
+}
+MAX_CONCURRENT_REFRESHES = 2
+POLL_JITTER = 0.1
 DEFAUL_SCAN_INTERVAL = 30
+DEFAULT_STATUS_MAX_AGE = 5
+DEFAULT_TEMPERATURE_DEADBAND = 0.2
+DEFAULT_LUX_DEADBAND = 5
+DEFAULT_MAX_SUPPRESS_INTERVAL = 900
+DEFAULT_EXECUTOR_WORKERS = 2
+DEFAULT_EXECUTOR_QUEUE = 20
+DEFAULT_EVENT_HISTORY_SIZE = 500
+DEFAULT_REPLAY_SPEED = 1
+DEFAULT_STATISTICS_WINDOW = 60
+DEFAULT_STALE_FAILURES = 3
+DEFAULT_STALE_MAX_AGE = 300
+# Share of refreshes traced, commands and logins are always traced
+DEFAULT_TRACE_SAMPLE_RATE = 0.1
+TRACE_BUFFER_SIZE = 2000
+
+# Rolling statistics of measurement readings
+STATISTICS_MEASUREMENTS = ["temperature", "brightness"]
+STATISTICS_BUCKETS = 12
+STAT_MEAN = "mean"
+STAT_MIN = "min"
+STAT_MAX = "max"
+STAT_RATE = "rate_of_change"
+STATISTIC_TYPES = [STAT_MEAN, STAT_MIN, STAT_MAX, STAT_RATE]
+
+# Per zone entity classes which can be turned off for large panels
+ZONE_ENTITY_STATE = "state"
+ZONE_ENTITY_TEMPERATURE = "temperature"
+ZONE_ENTITY_BRIGHTNESS = "brightness"
+ZONE_ENTITY_BYPASS = "bypass"
+ZONE_ENTITY_KEYFOB = "keyfob"
+ZONE_ENTITY_CLASSES = [
+    ZONE_ENTITY_STATE,
+    ZONE_ENTITY_TEMPERATURE,
+    ZONE_ENTITY_BRIGHTNESS,
+    ZONE_ENTITY_BYPASS,
+    ZONE_ENTITY_KEYFOB,
+]
+SUMMARY_OPEN = "open"
+SUMMARY_BYPASSED = "bypassed"
+SUMMARY_TROUBLE = "trouble"
+SUMMARY_TYPES = [SUMMARY_OPEN, SUMMARY_BYPASSED, SUMMARY_TROUBLE]
+
+TRANSPORT_LIVE = "live"
+TRANSPORT_RECORD = "record"
+TRANSPORT_REPLAY = "replay"
+# Capture is rotated once it reaches this size, keeping one previous file
+CAPTURE_MAX_BYTES = 10 * 1024 * 1024
+
+# Api client, imported on first use
+API_MODULE = "pyvisonicalarm.alarm"
+# Seconds the deferred api import may take before warning
+IMPORT_TIME_WARNING = 0.5
+
+# Benchmarks of entity hot paths, scaled to these device counts
+BENCHMARK_DEVICE_COUNTS = [10, 100, 500]
+BENCHMARK_STORE_VERSION = 1
+DEFAULT_BENCHMARK_THRESHOLD = 25
+
+# Synthetic load test sizes, run entirely locally
+LOAD_TEST_DEVICE_COUNTS = [100, 500, 2000]
+LOAD_TEST_PARTITION_COUNTS = [1, 4, 8]
+DEFAULT_LOAD_TEST_REFRESHES = 10
+
+# Login attempts per account, refilled one per interval, and block if cloud gives none
+LOGIN_BUCKET_SIZE = 3
+LOGIN_REFILL_INTERVAL = 120
+LOGIN_BLOCK_DEFAULT = 300
+
+# Hosts are probed for latency, and a failed host rested for a backoff before use again
+HOST_PROBE_INTERVAL = 300
+HOST_PROBE_TIMEOUT = 5
+HOST_SWITCH_MARGIN = 0.2
+HOST_LATENCY_SMOOTHING = 0.5
+HOST_RETRY_BASE = 30
+HOST_RETRY_MAX = 600
+
+SESSION_STORE_VERSION = 1
+ATTR_REST_VERSION = "rest_version"
+ATTR_DELAY_ENDS = "delay_ends"
+ATTR_USER_TOKEN = "user_token"
+ATTR_SESSION_TOKEN = "session_token"
 
 DATA = "data"
 UPDATE_LISTENER = "update_listener"
+SCHEDULER = f"{DOMAIN}_scheduler"
+LOGIN_GOVERNOR = f"{DOMAIN}_login_governor"
+ALARM_PANELS = "alarm_panels"
 VISONIC_PLATFORMS = ["alarm_control_panel", "sensor", "switch"]
 
+EVENT_CHANGES = f"{DOMAIN}_changes"
+CHANGE_DEVICE_FIELDS = ["state", "bypass", "temperature"]
+CHANGE_PARTITION_FIELDS = ["state", "status", "ready"]
+
+# Websocket panel snapshot, version is bumped on incompatible payload changes
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DEVICE_FIELDS = [
+    "device_number",
+    "device_type",
+    "subtype",
+    "location",
+    "partitions",
+    "state",
+    "bypass",
+    "temperature",
+    "brightness",
+    "warnings",
+]
+
+SERVICE_ARM_PARTITIONS = "arm_partitions"
+SERVICE_DISARM_PARTITIONS = "disarm_partitions"
+SERVICE_GET_EVENTS = "get_events"
+SERVICE_PROFILE = "profile"
+SERVICE_BENCHMARK = "benchmark"
+SERVICE_EXPORT_TRACE = "export_trace"
+SERVICE_LOAD_TEST = "load_test"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_PARTITIONS = "partitions"
+ATTR_MODE = "mode"
+ATTR_ZONE = "zone"
+ATTR_EVENT_TYPE = "event_type"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_LIMIT = "limit"
+ATTR_CYCLES = "cycles"
+ATTR_DURATION = "duration"
+ATTR_TOP = "top"
+ATTR_SAVE_BASELINE = "save_baseline"
+ATTR_THRESHOLD = "threshold"
+ATTR_FAIL_ON_REGRESSION = "fail_on_regression"
+ATTR_REFRESHES = "refreshes"
+
 PANELS = ["VISONIC_PANEL"]
 CONTACT_SENSORS = ["CONTACT_AUX", "CONTACT", "MC303_VANISH","CONTACT_V"]
 MOTION_SENSORS = [
@@ -20,7 +189,8 @@ MOTION_SENSORS = [
     "MOTION_CAMERA",
     "CURTAIN",
 ]
-OTHER_SENSORS = ["BASIC_KEYFOB", "KEYFOB_ARM_LED", "GENERIC_PROXY_TAG", "OUTDOOR"]
+KEYFOB_SENSORS = ["BASIC_KEYFOB", "KEYFOB_ARM_LED", "GENERIC_PROXY_TAG"]
+OTHER_SENSORS = [*KEYFOB_SENSORS, "OUTDOOR"]
 SUPPORTED_SENSORS = [*PANELS, *CONTACT_SENSORS, *MOTION_SENSORS, *OTHER_SENSORS]
 
 SENSOR_TYPE_FRIENDLY_NAME = {
@@ -1,28 +1,117 @@
+from __future__ import annotations
+
+import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_CODE, CONF_EMAIL, CONF_HOST, CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_UUID
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from pyvisonicalarm import alarm as VisonicAlarm
-from pyvisonicalarm.classes import Event as VisonicEvent
-from pyvisonicalarm.classes import Panel as VisonicPanel
-from pyvisonicalarm.classes import Partition as VisonicPartitionStatus
-from pyvisonicalarm.classes import PanelInfoPartition as VisonicPartitionInfo
-from pyvisonicalarm.classes import Status as VisonicStatus
-from pyvisonicalarm.devices import Device as VisonicDevice
-from pyvisonicalarm.exceptions import UnauthorizedError, UserAuthRequiredError
+from homeassistant.core import HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from pyvisonicalarm.const import TEXT_OPEN, TEXT_OPENED
+from pyvisonicalarm.exceptions import (
+    NotFoundError,
+    SessionTokenError,
+    UnauthorizedError,
+    UnsupportedRestAPIVersionError,
+    UserAuthRequiredError,
+)
 
+from .events import EventHistory
+from .executor import VisonicExecutor
+from .hosts import HostSelector, is_host_error, parse_hosts, probe_host
+from .loader import async_import_api
+from .login import async_get_login_governor
+from .metrics import VisonicAlarmMetrics
+from .profiler import VisonicProfiler
+from .statistics import RollingStatistic, reading_timestamp
+from .tracing import VisonicTracer
 from .const import (
+    API_DEADLINES,
+    ATTR_REST_VERSION,
+    ATTR_SESSION_TOKEN,
+    ATTR_USER_TOKEN,
+    CHANGE_DEVICE_FIELDS,
+    CHANGE_PARTITION_FIELDS,
+    CONF_ENTRY_DELAY,
+    CONF_EVENT_HISTORY_SIZE,
+    CONF_EXECUTOR_QUEUE,
+    CONF_EXECUTOR_WORKERS,
+    CONF_EXIT_DELAY,
+    CONF_HOSTS,
+    CONF_LUX_DEADBAND,
+    CONF_MAX_SUPPRESS_INTERVAL,
     CONF_PANEL_ID,
     CONF_PIN_REQUIRED_ARM,
     CONF_PIN_REQUIRED_DISARM,
+    CONF_REPLAY_SPEED,
+    CONF_STALE_FAILURES,
+    CONF_STALE_MAX_AGE,
+    CONF_STATISTICS_SENSORS,
+    CONF_STATISTICS_WINDOW,
+    CONF_STATUS_MAX_AGE,
+    CONF_SUMMARY_SENSORS,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TRACE_SAMPLE_RATE,
+    CONF_TRANSPORT,
+    CONF_ZONE_ENTITIES,
+    DEFAULT_API_DEADLINE,
+    DEFAULT_ENTRY_DELAY,
+    DEFAULT_EVENT_HISTORY_SIZE,
+    DEFAULT_EXECUTOR_QUEUE,
+    DEFAULT_EXECUTOR_WORKERS,
+    DEFAULT_EXIT_DELAY,
+    DEFAULT_LUX_DEADBAND,
+    DEFAULT_MAX_SUPPRESS_INTERVAL,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_STALE_FAILURES,
+    DEFAULT_STALE_MAX_AGE,
+    DEFAULT_STATISTICS_WINDOW,
+    DEFAULT_STATUS_MAX_AGE,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TRACE_SAMPLE_RATE,
     DEFAUL_SCAN_INTERVAL,
+    DELAY_CHECK_MARGIN,
+    DELAY_MAX_OVERRUN,
+    DELAY_RECHECK_INTERVAL,
     DOMAIN,
+    EVENT_CHANGES,
+    HOST_PROBE_INTERVAL,
+    HOST_PROBE_TIMEOUT,
+    PROCESS_POLL_INTERVAL,
+    PROCESS_TIMEOUT,
+    REFRESH_BUDGET,
+    REFRESH_DEBOUNCE,
+    SESSION_STORE_VERSION,
+    SNAPSHOT_DEVICE_FIELDS,
+    SNAPSHOT_VERSION,
+    STATISTICS_MEASUREMENTS,
+    STATUS_ENTRY_DELAY,
+    STATUS_EXIT,
+    SUMMARY_BYPASSED,
+    SUMMARY_OPEN,
+    SUMMARY_TROUBLE,
+    TRACE_BUFFER_SIZE,
+    TRANSPORT_LIVE,
+    TRANSPORT_RECORD,
+    TRANSPORT_REPLAY,
+    ZONE_ENTITY_CLASSES,
 )
 
+if TYPE_CHECKING:
+    from pyvisonicalarm import alarm as VisonicAlarm
+    from pyvisonicalarm.classes import Event as VisonicEvent
+    from pyvisonicalarm.classes import Panel as VisonicPanel
+    from pyvisonicalarm.classes import PanelInfoPartition as VisonicPartitionInfo
+    from pyvisonicalarm.classes import Partition as VisonicPartitionStatus
+    from pyvisonicalarm.classes import Status as VisonicStatus
+    from pyvisonicalarm.devices import Device as VisonicDevice
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -34,6 +123,31 @@ class VisonicAlarmData:
     panel_info: VisonicPanel = None
     status: VisonicStatus = None
 
+
+@dataclass
+class PartitionDelay:
+    """Exit or entry delay counted down locally."""
+
+    status: str
+    ends: float
+    ends_at: datetime
+
+
+@dataclass
+class PendingProcess:
+    """Command process awaiting completion."""
+
+    token: str
+    confirm: Callable[[], bool] | None
+    registered: float
+    deadline: float
+    future: asyncio.Future
+
+    def status_after(self, status_updated: float) -> bool:
+        """Return if a status fetched at status_updated was fetched after the command was sent."""
+        return status_updated > self.registered
+
+
 class VisonicAlarmCoordinator(DataUpdateCoordinator):
     """Data update coordinator."""
 
@@ -48,83 +162,752 @@ class VisonicAlarmCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name=f"{DOMAIN} ({config_entry.unique_id})",
             update_method=self.async_update_data,
-            update_interval=timedelta(seconds=self.scan_interval),
+            # Polling is driven by the shared scheduler across all config entries
+            update_interval=None,
         )
 
         self.alarm_data = VisonicAlarmData()
+        self.metrics = VisonicAlarmMetrics()
         self.last_update = datetime.now()
         self.alarm: VisonicAlarm.Setup = None
         self.events: list[VisonicEvent] = []
         self.panel_info: VisonicPanel = None
         self.status: VisonicStatus = None
+        self.status_updated: float = 0
+        self.data_updated: float = 0
+        self.consecutive_failures = 0
+        self.serving_stale = False
+        self._stale_refresh = False
         self.devices: list[VisonicDevice] = []
         self.pin_required_arm = config_entry.options.get(CONF_PIN_REQUIRED_ARM, True)
         self.pin_required_disarm = config_entry.options.get(CONF_PIN_REQUIRED_DISARM, True)
+        self.status_max_age = config_entry.options.get(CONF_STATUS_MAX_AGE, DEFAULT_STATUS_MAX_AGE)
+        self.temperature_deadband = config_entry.options.get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND)
+        self.lux_deadband = config_entry.options.get(CONF_LUX_DEADBAND, DEFAULT_LUX_DEADBAND)
+        self.max_suppress_interval = config_entry.options.get(
+            CONF_MAX_SUPPRESS_INTERVAL, DEFAULT_MAX_SUPPRESS_INTERVAL
+        )
+        self.summary_sensors = config_entry.options.get(CONF_SUMMARY_SENSORS, False)
+        self.zone_entities = config_entry.options.get(CONF_ZONE_ENTITIES, ZONE_ENTITY_CLASSES)
+        self._zone_summary: tuple[int, dict] = (-1, {})
+        self.stale_failures = int(config_entry.options.get(CONF_STALE_FAILURES, DEFAULT_STALE_FAILURES))
+        self.stale_max_age = config_entry.options.get(CONF_STALE_MAX_AGE, DEFAULT_STALE_MAX_AGE)
+        self.statistics_window = int(config_entry.options.get(CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW))
+        self.statistics_sensors = config_entry.options.get(CONF_STATISTICS_SENSORS, False)
+        self.statistics: dict[tuple[int, str], RollingStatistic] = {}
+        self.tracer = VisonicTracer(
+            f"{DOMAIN} {config_entry.title}",
+            TRACE_BUFFER_SIZE,
+            config_entry.options.get(CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE),
+        )
+        self.profiler = VisonicProfiler(hass, f"{DOMAIN}_{config_entry.data[CONF_PANEL_ID]}")
+        self.executor = VisonicExecutor(
+            f"{DOMAIN}_{config_entry.entry_id}",
+            int(config_entry.options.get(CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS)),
+            int(config_entry.options.get(CONF_EXECUTOR_QUEUE, DEFAULT_EXECUTOR_QUEUE)),
+            self.profiler,
+        )
+        event_history_size = int(config_entry.options.get(CONF_EVENT_HISTORY_SIZE, DEFAULT_EVENT_HISTORY_SIZE))
+        self.event_history = EventHistory(event_history_size) if event_history_size else None
+        self.transport = config_entry.options.get(CONF_TRANSPORT, TRANSPORT_LIVE)
+        self.replay_speed = config_entry.options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED)
+        self.capture_path = hass.config.path(f"{DOMAIN}_{config_entry.data[CONF_PANEL_ID]}_capture.jsonl")
+        self.rest_version: str | None = None
+        # Incremented whenever status or devices are replaced, to key data derived from them
+        self.data_version = 0
+        self._session_restored = False
+        self.hosts = HostSelector(
+            parse_hosts(config_entry.options.get(CONF_HOSTS)) or parse_hosts(config_entry.data[CONF_HOST])
+        )
+        self._probe_clients: dict[str, VisonicAlarm.Setup] = {}
+        self._probe_task: asyncio.Task | None = None
+        self.session_store = Store(hass, SESSION_STORE_VERSION, f"{DOMAIN}.{config_entry.entry_id}.session")
+        self._change_snapshot: tuple[dict, dict] = ({}, {})
+        self._snapshot: tuple[int, dict] = (-1, {})
+        self.exit_delay = config_entry.options.get(CONF_EXIT_DELAY, 0)
+        self.entry_delay = config_entry.options.get(CONF_ENTRY_DELAY, DEFAULT_ENTRY_DELAY)
+        self.partition_delays: dict[int, PartitionDelay] = {}
+        self._cancel_delay_check = None
+        self._pending_refresh: asyncio.Task | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._pending_refresh_full = False
+        self._pending_processes: dict[str, PendingProcess] = {}
+        # Set on the synthetic coordinators of a load test, whose entities are never added
+        self.load_test = False
+        self._process_poller: asyncio.Task | None = None
+
+    async def async_add_job(self, func, *args):
+        """Run blocking Visonic API call in the integration executor within its deadline."""
+        name = getattr(func, "__name__", None)
+        deadline = API_DEADLINES.get(name, DEFAULT_API_DEADLINE)
+        with self.tracer.span(f"api.{name}", "api", root_sample_rate=0, deadline=deadline):
+            return await self.executor.async_add_job(func, *args, deadline=deadline)
 
     async def validate_logged_in(self):
         """Validate logged in to account"""
         if not self.alarm:
             _LOGGER.debug("Initiating Visonic API")
-            self.alarm = await self.hass.async_add_executor_job(
-                VisonicAlarm.Setup,
-                self.config_entry.data[CONF_HOST],
-                self.config_entry.data[CONF_UUID],
-            )
-            _LOGGER.debug(
-                "Supported rest versions: %s", await self.hass.async_add_executor_job(self.alarm.get_rest_versions)
-            )
-            await self.hass.async_add_executor_job(self.alarm.set_rest_version)
+            if self.transport == TRANSPORT_REPLAY:
+                from .transport import ReplayAlarm  # pylint: disable=import-outside-toplevel
+
+                _LOGGER.info("Replaying Visonic API traffic from %s", self.capture_path)
+                self.alarm = await self.async_add_job(ReplayAlarm, self.capture_path, self.replay_speed)
+            else:
+                visonic_alarm = await async_import_api(self.hass)
+                if len(self.hosts.hosts) > 1:
+                    await self.async_probe_hosts()
+                    self.hosts.active = self.hosts.select()
+                self.alarm = await self.async_add_job(
+                    visonic_alarm.Setup,
+                    self.hosts.active,
+                    self.config_entry.data[CONF_UUID],
+                )
+                if not await self.async_restore_session():
+                    self.rest_version = await self.async_add_job(self.get_latest_rest_version)
+                    self.alarm.api.set_rest_version(self.rest_version)
+
+                if self.transport == TRANSPORT_RECORD:
+                    from .transport import RecordingAlarm  # pylint: disable=import-outside-toplevel
+
+                    _LOGGER.info("Recording Visonic API traffic to %s", self.capture_path)
+                    self.alarm = RecordingAlarm(self.alarm, self.capture_path)
 
         try:
-            await self.hass.async_add_executor_job(self.alarm.api.is_logged_in)
+            await self.async_add_job(self.alarm.api.is_logged_in)
+            self._session_restored = False
             return True
-        except (UserAuthRequiredError, UnauthorizedError):
+        except (SessionTokenError, UserAuthRequiredError, UnauthorizedError):
             _LOGGER.debug("Not logged in - so do it now!")
+        except (NotFoundError, UnsupportedRestAPIVersionError) as ex:
+            # Only a stale rest version discards the session, host errors are left for failover
+            if not self._session_restored:
+                raise
+            await self.async_discard_session(ex)
+
+        self._session_restored = False
+        try:
+            # Logins from all entries and flows go through the governor to avoid a cloud block
+            await async_get_login_governor(self.hass).async_login(
+                self.config_entry.data[CONF_EMAIL],
+                f"{self.config_entry.data[CONF_EMAIL]}-{self.config_entry.data[CONF_PANEL_ID]}",
+                self.async_login,
+            )
+            return True
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _LOGGER.error("Unable to connect to alarm panel.  Error is - %s", ex)
+            return False
+
+    async def async_login(self):
+        """Log in to account and panel."""
+        with self.tracer.span("login", "login", root_sample_rate=1):
+            await self.async_add_job(
+                self.alarm.authenticate,
+                self.config_entry.data[CONF_EMAIL],
+                self.config_entry.data[CONF_PASSWORD],
+            )
+            await self.async_add_job(
+                self.alarm.panel_login,
+                self.config_entry.data[CONF_PANEL_ID],
+                self.config_entry.data[CONF_CODE],
+            )
+            self.panel_info = await self.async_add_job(self.alarm.get_panel_info)
+            await self.async_save_session()
+
+    async def async_probe_hosts(self):
+        """Measure latency of all hosts with the cheap unauthenticated version request."""
+        visonic_alarm = await async_import_api(self.hass)
+
+        async def async_probe(host: str):
             try:
-                await self.hass.async_add_executor_job(
-                    self.alarm.authenticate,
-                    self.config_entry.data[CONF_EMAIL],
-                    self.config_entry.data[CONF_PASSWORD],
-                )
-                await self.hass.async_add_executor_job(
-                    self.alarm.panel_login,
-                    self.config_entry.data[CONF_PANEL_ID],
-                    self.config_entry.data[CONF_CODE],
+                # Probes share the integration executor, so a hung host cannot tie up Home Assistant's pool
+                if host not in self._probe_clients:
+                    self._probe_clients[host] = await self.executor.async_add_job(
+                        visonic_alarm.Setup, host, self.config_entry.data[CONF_UUID], deadline=HOST_PROBE_TIMEOUT
+                    )
+                latency = await self.executor.async_add_job(
+                    probe_host, self._probe_clients[host], deadline=HOST_PROBE_TIMEOUT
                 )
-                self.panel_info = await self.hass.async_add_executor_job(self.alarm.get_panel_info)
-                return True
+                self.hosts.record_latency(host, latency)
             except Exception as ex:  # pylint: disable=broad-exception-caught
-                _LOGGER.error("Unable to connect to alarm panel.  Error is - %s", ex)
-                return False
+                _LOGGER.debug("Probe of %s failed: %s", host, ex)
+                self.hosts.record_failure(host)
+
+        with self.tracer.span("probe_hosts", "hosts", hosts=len(self.hosts.hosts)):
+            await asyncio.gather(*(async_probe(host) for host in self.hosts.hosts))
+        self.hosts.probed = time.monotonic()
+
+    async def _async_probe_and_select(self):
+        """Probe hosts and switch to the fastest healthy one."""
+        await self.async_probe_hosts()
+        if (host := self.hosts.select()) != self.hosts.active:
+            self.switch_host(host)
+
+    @callback
+    def async_schedule_probe(self):
+        """Start a background probe of hosts if one is due."""
+        if (
+            len(self.hosts.hosts) < 2
+            or self.transport == TRANSPORT_REPLAY
+            or (self._probe_task and not self._probe_task.done())
+            or time.monotonic() - self.hosts.probed < HOST_PROBE_INTERVAL
+        ):
+            return
+        self._probe_task = self.hass.async_create_background_task(
+            self._async_probe_and_select(), f"{DOMAIN} probe hosts {self.config_entry.title}"
+        )
+
+    def switch_host(self, host: str):
+        """Point the api at host, keeping the session.
+
+        Tokens are issued by the Visonic cloud rather than the host, so are kept.
+        If the new host rejects them, the next is_logged_in check logs in again.
+        """
+        _LOGGER.warning("Switching Visonic host from %s to %s", self.hosts.active, host)
+        self.hosts.active = host
+        self.hosts.switches += 1
+        if self.alarm:
+            # Recording wraps the api in a new proxy on each access, so set it on the real one
+            alarm = self.alarm.target if self.transport == TRANSPORT_RECORD else self.alarm
+            # pyvisonicalarm has no setter for its hostname
+            alarm.api._API__hostname = host  # pylint: disable=protected-access
+
+    def failover(self, error: Exception) -> bool:
+        """Return if a host error has moved the api to another host, so the request can be retried."""
+        if len(self.hosts.hosts) < 2 or not self.alarm or self.transport == TRANSPORT_REPLAY:
+            return False
+        if not is_host_error(error):
+            return False
+        failed = self.hosts.active
+        self.hosts.record_failure(failed)
+        if (host := self.hosts.select()) == failed:
+            return False
+        _LOGGER.warning("Host %s failed: %s", failed, error)
+        self.switch_host(host)
+        return True
+
+    def get_latest_rest_version(self) -> str:
+        """Return latest rest version supported by the server."""
+        rest_versions = self.alarm.get_rest_versions()
+        _LOGGER.debug("Supported rest versions: %s", rest_versions)
+        return sorted(rest_versions, key=float)[-1]
+
+    async def async_restore_session(self) -> bool:
+        """Restore stored session tokens to the api.
+
+        Tokens are checked by the following is_logged_in call and a full login is
+        only done if they are rejected.
+        """
+        session = await self.session_store.async_load()
+        if not session:
+            return False
+
+        _LOGGER.debug("Restoring stored Visonic session")
+        self.rest_version = session[ATTR_REST_VERSION]
+        self.alarm.api.set_rest_version(self.rest_version)
+        # pyvisonicalarm has no setters for its tokens
+        self.alarm.api._API__user_token = session[ATTR_USER_TOKEN]  # pylint: disable=protected-access
+        self.alarm.api._API__session_token = session[ATTR_SESSION_TOKEN]  # pylint: disable=protected-access
+        self._session_restored = True
+        return True
+
+    async def async_discard_session(self, error: Exception):
+        """Discard a stored session the server rejected and fetch its current rest version.
+
+        A stored session can outlive the rest version it was made with, such as
+        after a server upgrade, which makes every call fail as not found.
+        """
+        _LOGGER.warning("Stored session was rejected, logging in again.  Error is %s", error)
+        self._session_restored = False
+        await self.session_store.async_remove()
+        self.rest_version = await self.async_add_job(self.get_latest_rest_version)
+        self.alarm.api.set_rest_version(self.rest_version)
+
+    async def async_save_session(self):
+        """Store session tokens for use after restart."""
+        if self.transport == TRANSPORT_REPLAY:
+            return
+        await self.session_store.async_save(
+            {
+                ATTR_REST_VERSION: self.rest_version,
+                ATTR_USER_TOKEN: self.alarm.api.user_token,
+                ATTR_SESSION_TOKEN: self.alarm.api.session_token,
+            }
+        )
 
     async def async_update_data(self):
         """Update all alarm statuses."""
-        try:
-            if await self.validate_logged_in():
-                self.status = await self.hass.async_add_executor_job(self.alarm.get_status)
-                self.panel_info = await self.hass.async_add_executor_job(self.alarm.get_panel_info)
-                self.devices = await self.hass.async_add_executor_job(self.alarm.get_devices)
-                self.last_update = datetime.now()
-        except Exception as ex:
-            _LOGGER.error("Update failed: %s", ex)
-            raise
+        start = time.perf_counter()
+        with self.tracer.span("refresh", "refresh"):
+            try:
+                async with asyncio.timeout(REFRESH_BUDGET):
+                    status, panel_info, devices, events = await self.async_fetch_data()
+
+                    # Only replace data once all calls have succeeded
+                    self.status = status
+                    self.status_updated = time.monotonic()
+                    self.data_updated = self.status_updated
+                    self.data_version += 1
+                    self.panel_info = panel_info
+                    self.devices = devices
+                    self.update_statistics()
+                    if events is not None:
+                        self.events = events
+                        self.event_history.add_events(events)
+                    self.last_update = datetime.now()
+            except Exception as ex:
+                if self.serve_stale(ex):
+                    return True
+                if isinstance(ex, TimeoutError):
+                    _LOGGER.error("Update did not complete within %ss", REFRESH_BUDGET)
+                    raise UpdateFailed(f"Update did not complete within {REFRESH_BUDGET}s") from ex
+                _LOGGER.error("Update failed: %s", ex)
+                raise
+            finally:
+                self.metrics.record_refresh(start)
+
+        self.consecutive_failures = 0
+        self.serving_stale = False
+        self.async_schedule_probe()
+        return True
+
+    async def async_fetch_data(self) -> tuple:
+        """Fetch status, panel info, devices and events, failing over to another host on a host error."""
+        while True:
+            host = self.hosts.active
+            try:
+                if not await self.validate_logged_in():
+                    raise UpdateFailed("Unable to log in to alarm panel")
+
+                status = await self.async_add_job(self.alarm.get_status)
+                panel_info = await self.async_add_job(self.alarm.get_panel_info)
+                devices = await self.async_add_job(self.alarm.get_devices)
+                events = None
+                if self.event_history is not None:
+                    events = await self.async_add_job(self.alarm.get_events)
+                self.hosts.record_success(host)
+                return status, panel_info, devices, events
+            except Exception as ex:
+                if not self.failover(ex):
+                    raise
+
+    @property
+    def data_age(self) -> float | None:
+        """Return seconds since data was last fully refreshed."""
+        return time.monotonic() - self.data_updated if self.data_updated else None
+
+    def serve_stale(self, error: Exception) -> bool:
+        """Return if the last good data should be served rather than failing the update.
 
+        Entities only go unavailable once failures or data age pass the staleness
+        tolerance, so a transient cloud error does not flap every entity.
+        """
+        self.consecutive_failures += 1
+        if (
+            not self.data_updated
+            or self.consecutive_failures > self.stale_failures
+            or self.data_age > self.stale_max_age
+        ):
+            self.serving_stale = False
+            return False
+
+        _LOGGER.warning(
+            "Update failed, serving data from %.0fs ago (failure %s of %s).  Error is %s",
+            self.data_age,
+            self.consecutive_failures,
+            self.stale_failures,
+            error,
+        )
+        self.serving_stale = True
+        self._stale_refresh = True
         return True
 
-    async def async_update_status(self):
-        """Update alarm status."""
+    def update_statistics(self):
+        """Add new measurement readings to rolling statistics."""
+        if not self.statistics_window:
+            return
+        for device in self.devices:
+            for measurement in STATISTICS_MEASUREMENTS:
+                value = getattr(device, measurement, None)
+                if value is None:
+                    continue
+                key = (device.id, measurement)
+                if key not in self.statistics:
+                    self.statistics[key] = RollingStatistic(self.statistics_window * 60)
+                try:
+                    self.statistics[key].add(
+                        reading_timestamp(getattr(device, f"{measurement}_last_updated", None)), float(value)
+                    )
+                except (TypeError, ValueError):
+                    _LOGGER.debug("Invalid %s reading of device %s: %s", measurement, device.id, value)
+
+    def get_statistics(self, device_id: int, measurement: str) -> dict[str, float | None]:
+        """Get rolling statistics of device measurement."""
+        if statistic := self.statistics.get((device_id, measurement)):
+            return statistic.as_dict()
+        return {}
+
+    def get_change_snapshot(self) -> tuple[dict, dict]:
+        """Return tracked device and partition fields."""
+        devices = {
+            device.id: {field: getattr(device, field, None) for field in CHANGE_DEVICE_FIELDS}
+            for device in self.devices or []
+        }
+        partitions = {
+            partition.id: {field: getattr(partition, field, None) for field in CHANGE_PARTITION_FIELDS}
+            for partition in (self.status.partitions if self.status else [])
+        }
+        return devices, partitions
+
+    @staticmethod
+    def get_changes(old: dict, new: dict) -> list[dict]:
+        """Return changed fields of items in both snapshots."""
+        changes = []
+        for item_id, fields in new.items():
+            if item_id not in old:
+                continue
+            changed = {
+                field: {"old": old[item_id][field], "new": value}
+                for field, value in fields.items()
+                if old[item_id][field] != value
+            }
+            if changed:
+                changes.append({"id": item_id, "changes": changed})
+        return changes
+
+    @callback
+    def async_publish_changes(self) -> None:
+        """Fire one bus event with all device and partition changes since last refresh."""
+        old_devices, old_partitions = self._change_snapshot
+        self._change_snapshot = self.get_change_snapshot()
+        new_devices, new_partitions = self._change_snapshot
+
+        device_changes = self.get_changes(old_devices, new_devices)
+        partition_changes = self.get_changes(old_partitions, new_partitions)
+        if (device_changes or partition_changes) and not self.load_test:
+            self.hass.bus.async_fire(
+                EVENT_CHANGES,
+                {
+                    "config_entry_id": self.config_entry.entry_id,
+                    "panel_id": self.config_entry.data[CONF_PANEL_ID],
+                    "devices": device_changes,
+                    "partitions": partition_changes,
+                },
+            )
+
+    def get_snapshot(self) -> dict:
+        """Return compact snapshot of status, partitions and devices.
+
+        Built once per refresh and shared by all websocket subscribers.  Items are
+        keyed by id and fields without a value are left out.
+        """
+        if self._snapshot[0] != self.data_version:
+            partitions = {}
+            for partition in self.status.partitions if self.status else []:
+                partition_info = self.get_partition_info_by_id(partition.id)
+                partitions[str(partition.id)] = {
+                    "name": partition_info.name if partition_info else None,
+                    **{field: getattr(partition, field, None) for field in CHANGE_PARTITION_FIELDS},
+                }
+            devices = {
+                str(device.id): {
+                    field: value
+                    for field in SNAPSHOT_DEVICE_FIELDS
+                    if (value := getattr(device, field, None)) not in [None, []]
+                }
+                for device in self.devices or []
+            }
+            self._snapshot = (
+                self.data_version,
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "config_entry_id": self.config_entry.entry_id,
+                    "panel_id": self.config_entry.data[CONF_PANEL_ID],
+                    "last_update": self.last_update.astimezone().isoformat(),
+                    "connected": self.status.connected if self.status else None,
+                    "partitions": partitions,
+                    "devices": devices,
+                },
+            )
+        return self._snapshot[1]
+
+    @staticmethod
+    def get_snapshot_delta(old: dict, new: dict) -> dict:
+        """Return what changed between two snapshots.
+
+        Changed items carry only their changed fields, with None for a removed field.
+        """
+        delta = {
+            "version": new["version"],
+            "config_entry_id": new["config_entry_id"],
+            "last_update": new["last_update"],
+        }
+        if old.get("connected") != new["connected"]:
+            delta["connected"] = new["connected"]
+
+        for items in ["partitions", "devices"]:
+            old_items = old.get(items, {})
+            changed = {}
+            for item_id, fields in new[items].items():
+                old_fields = old_items.get(item_id, {})
+                item_changes = {field: value for field, value in fields.items() if old_fields.get(field) != value}
+                item_changes.update({field: None for field in old_fields if field not in fields})
+                if item_changes:
+                    changed[item_id] = item_changes
+            if changed:
+                delta[items] = changed
+            if removed := [item_id for item_id in old_items if item_id not in new[items]]:
+                delta[f"removed_{items}"] = removed
+        return delta
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and record fan-out cost."""
+        if self._stale_refresh:
+            # Nothing changed, so skip the fan-out of a refresh serving stale data
+            self._stale_refresh = False
+            return
+        cpu_start = time.process_time()
+        writes_start = self.metrics.state_writes
+        self.async_track_delays()
+        with self.tracer.span("fanout", "refresh", root_sample_rate=0):
+            self.async_publish_changes()
+            super().async_update_listeners()
+        self.metrics.record_fanout(cpu_start, writes_start)
+        self.profiler.async_cycle_complete()
+
+    def get_delay_duration(self, partition_id: int, status: str) -> float:
+        """Return configured exit or entry delay of partition in seconds."""
+        if status == STATUS_ENTRY_DELAY:
+            return self.entry_delay
+        if self.exit_delay:
+            return self.exit_delay
+        partition_info = self.get_partition_info_by_id(partition_id)
+        if partition_info and partition_info.exit_delay_time:
+            return partition_info.exit_delay_time
+        return DEFAULT_EXIT_DELAY
+
+    @callback
+    def async_track_delays(self) -> None:
+        """Count down exit and entry delays and schedule a status check for when they should end.
+
+        Saves polling through a delay to find out when it ends.
+        """
+        partition_statuses = {}
+        if self.status:
+            partition_statuses = {partition.id: partition.status for partition in self.status.partitions}
+        for partition_id in list(self.partition_delays):
+            if partition_statuses.get(partition_id) != self.partition_delays[partition_id].status:
+                self.partition_delays.pop(partition_id)
+
+        for partition_id, status in partition_statuses.items():
+            if status in [STATUS_EXIT, STATUS_ENTRY_DELAY] and partition_id not in self.partition_delays:
+                duration = self.get_delay_duration(partition_id, status)
+                _LOGGER.debug("Partition %s %s delay of %ss started", partition_id, status, duration)
+                self.partition_delays[partition_id] = PartitionDelay(
+                    status, time.monotonic() + duration, datetime.now().astimezone() + timedelta(seconds=duration)
+                )
+
+        self._async_schedule_delay_check()
+
+    @callback
+    def _async_schedule_delay_check(self) -> None:
+        """Schedule a status check for just after the next delay should end."""
+        self.async_cancel_delay_check()
+        now = time.monotonic()
+        ends = [delay.ends for delay in self.partition_delays.values() if now < delay.ends + DELAY_MAX_OVERRUN]
+        if not ends:
+            return
+        # Delays that have overrun are rechecked less often until the overrun limit
+        check_in = min(ends) - now + DELAY_CHECK_MARGIN if min(ends) > now else DELAY_RECHECK_INTERVAL
+        self._cancel_delay_check = async_call_later(
+            self.hass, check_in, HassJob(self._async_delay_check, cancel_on_shutdown=True)
+        )
+
+    async def _async_delay_check(self, _now) -> None:
+        """Check status when a delay should have ended."""
+        self._cancel_delay_check = None
+        await self.async_request_update(status_only=True)
+
+    @callback
+    def async_cancel_delay_check(self) -> None:
+        """Cancel scheduled delay status check."""
+        if self._cancel_delay_check:
+            self._cancel_delay_check()
+            self._cancel_delay_check = None
+
+    @callback
+    def async_cancel_probe(self) -> None:
+        """Cancel running host probe."""
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+
+    @property
+    def delay_check_pending(self) -> bool:
+        """Return if a delay status check is scheduled."""
+        return self._cancel_delay_check is not None
+
+    @property
+    def login_blocked_for(self) -> float:
+        """Return seconds until the account's login block expires."""
+        return async_get_login_governor(self.hass).blocked_for(self.config_entry.data[CONF_EMAIL])
+
+    @property
+    def status_age(self) -> float:
+        """Return seconds since status was last fetched."""
+        return time.monotonic() - self.status_updated
+
+    async def async_update_status(self, max_age: float = 0):
+        """Update alarm status.
+
+        If max_age is given, the current status is reused if it was fetched
+        within that many seconds.
+        """
+        if max_age and self.status and self.status_age <= max_age:
+            _LOGGER.debug("Using status fetched %.1fs ago", self.status_age)
+            return True
+
         try:
-            if await self.validate_logged_in():
-                self.status = await self.hass.async_add_executor_job(self.alarm.get_status)
+            with self.tracer.span("status_update", "refresh", root_sample_rate=0):
+                if await self.validate_logged_in():
+                    self.status = await self.async_add_job(self.alarm.get_status)
+                    self.status_updated = time.monotonic()
+                    self.data_version += 1
+                    return True
         except Exception as ex:  # pylint: disable=broad-exception-caught
             _LOGGER.error("Status update failed. Error is - %s", ex)
+        return False
+
+    async def async_fetch_status(self) -> bool:
+        """Fetch status without a login check.
+
+        For polling straight after a command, when the session is known to be valid.
+        """
+        try:
+            self.status = await self.async_add_job(self.alarm.get_status)
+            self.status_updated = time.monotonic()
+            self.data_version += 1
+            return True
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _LOGGER.debug("Status fetch failed. Error is - %s", ex)
+        return False
+
+    async def async_request_update(self, status_only: bool = False) -> bool:
+        """Request a refresh shared by all callers.
+
+        Requests made within the debounce window, or while a refresh is
+        running, are merged into a single refresh and every caller awaits its
+        result.  Only one refresh runs at a time.  If any caller needs more than
+        the status, a full refresh is done.
+        """
+        if not status_only:
+            self._pending_refresh_full = True
+
+        if not self._pending_refresh:
+            self._pending_refresh = self.hass.async_create_task(self._async_debounced_refresh())
+
+        return await asyncio.shield(self._pending_refresh)
+
+    async def _async_debounced_refresh(self) -> bool:
+        """Run a merged refresh after the debounce window."""
+        with self.tracer.span("debounce", "refresh", root_sample_rate=0):
+            await asyncio.sleep(REFRESH_DEBOUNCE)
+
+        # Requests made while waiting for a running refresh join this one as its follow up
+        async with self._refresh_lock:
+            # Requests from here on start a new refresh as this one may predate them
+            full_refresh = self._pending_refresh_full
+            self._pending_refresh = None
+            self._pending_refresh_full = False
+
+            if full_refresh:
+                await self.async_refresh()
+                return self.last_update_success
+
+            result = await self.async_update_status()
+            self.async_update_listeners()
+            return result
 
     async def get_process_status(self, process_token):
         """Get status of command process."""
-        process_status = await self.hass.async_add_executor_job(self.alarm.get_process_status, process_token)
+        process_status = await self.async_add_job(self.alarm.get_process_status, process_token)
         if process_status:
             return process_status[0]
 
+    async def async_wait_for_processes(self, processes: list[tuple[str, Callable[[], bool] | None]]) -> list[bool]:
+        """Wait for command processes to complete.
+
+        All pending processes, including those of other callers, are polled
+        together with one process status call and at most one status fetch per
+        round.  If a confirm function is given, a process also completes once the
+        status shows it succeeded.
+        """
+        registered = time.monotonic()
+        deadline = registered + PROCESS_TIMEOUT
+        futures = []
+        for token, confirm in processes:
+            if token not in self._pending_processes:
+                self._pending_processes[token] = PendingProcess(
+                    token, confirm, registered, deadline, self.hass.loop.create_future()
+                )
+            futures.append(self._pending_processes[token].future)
+
+        if futures and not (self._process_poller and not self._process_poller.done()):
+            self._process_poller = self.hass.async_create_task(self._async_poll_processes())
+        return list(await asyncio.gather(*futures))
+
+    async def _async_poll_processes(self):
+        """Poll pending processes until all have completed."""
+        while self._pending_processes:
+            pending = list(self._pending_processes.values())
+            try:
+                jobs = [self.async_add_job(self.alarm.get_process_status, ",".join(p.token for p in pending))]
+                # A status fetched after the commands and within the poll interval, by a refresh or
+                # last round, is reused.  One from before a command, such as its ready check, is not.
+                confirming = [process for process in pending if process.confirm]
+                if confirming and (
+                    self.status_age > PROCESS_POLL_INTERVAL
+                    or not all(process.status_after(self.status_updated) for process in confirming)
+                ):
+                    jobs.append(self.async_fetch_status())
+                results = await asyncio.gather(*jobs)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                _LOGGER.error("Unable to complete process action.  Error is %s", ex)
+                for process in pending:
+                    self._complete_process(process, False)
+                continue
+
+            process_statuses = {process_status.token: process_status for process_status in results[0] or []}
+            status_fresh = self.status_age <= PROCESS_POLL_INTERVAL
+            for process in pending:
+                process_status = process_statuses.get(process.token)
+                _LOGGER.debug("Process Status - %s", process_status)
+                if process_status and process_status.error:
+                    _LOGGER.error("Aborting process action due to process error. Error is %s", process_status.error)
+                    self._complete_process(process, False)
+                elif process_status and process_status.status == "succeeded":
+                    self._complete_process(process, True)
+                elif (
+                    process.confirm
+                    and status_fresh
+                    and process.status_after(self.status_updated)
+                    and process.confirm()
+                ):
+                    _LOGGER.debug("Process confirmed by status before process status succeeded")
+                    self._complete_process(process, True)
+                elif time.monotonic() > process.deadline:
+                    _LOGGER.error("Process action did not complete within %ss", PROCESS_TIMEOUT)
+                    self._complete_process(process, False)
+
+            if self._pending_processes:
+                with self.tracer.span("sleep", "command", root_sample_rate=0, processes=len(self._pending_processes)):
+                    await asyncio.sleep(PROCESS_POLL_INTERVAL)
+
+    def _complete_process(self, process: PendingProcess, result: bool):
+        """Remove process from pending and give its result to waiters."""
+        self._pending_processes.pop(process.token, None)
+        if not process.future.done():
+            process.future.set_result(result)
+
     def get_partition_info_by_id(self, partition_id) -> VisonicPartitionInfo:
         """Get status of partition."""
         if self.status and partition_id in [partition.id for partition in self.panel_info.partitions]:
@@ -135,6 +918,34 @@ class VisonicAlarmCoordinator(DataUpdateCoordinator):
         if self.status and partition_id in [partition.id for partition in self.status.partitions]:
             return next(partition for partition in self.status.partitions if partition.id == partition_id)
 
+    def get_zone_summary(self, partition_id: int) -> dict[str, list[dict]]:
+        """Get open, bypassed and trouble zones of partition.
+
+        Calculated once per refresh for all partitions.
+        """
+        if self._zone_summary[0] != self.data_version:
+            summaries = {}
+            for partition in self.status.partitions if self.status else []:
+                summaries[partition.id] = {SUMMARY_OPEN: [], SUMMARY_BYPASSED: [], SUMMARY_TROUBLE: []}
+
+            for device in self.devices or []:
+                if device.device_type == "CONTROL_PANEL":
+                    continue
+                zone = {"id": device.id, "zone": device.device_number, "location": device.location}
+                for summary_partition_id, summary in summaries.items():
+                    if device.partitions and summary_partition_id not in [-1, *device.partitions]:
+                        continue
+                    if getattr(device, "state", None) == TEXT_OPEN:
+                        summary[SUMMARY_OPEN].append(zone)
+                    if device.bypass:
+                        summary[SUMMARY_BYPASSED].append(zone)
+                    if any(warning.get("type") != TEXT_OPENED for warning in device.warnings):
+                        summary[SUMMARY_TROUBLE].append(zone)
+
+            self._zone_summary = (self.data_version, summaries)
+
+        return self._zone_summary[1].get(partition_id, {SUMMARY_OPEN: [], SUMMARY_BYPASSED: [], SUMMARY_TROUBLE: []})
+
     def get_device_by_id(self, device_id: int) -> VisonicDevice | None:
         """Get device by device id."""
         if not self.devices:
@@ -6,10 +6,13 @@ import json
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntry
 
 from .const import DOMAIN, DATA
+from .loader import IMPORT_TIMES
+from .login import async_get_login_governor
 
 ANON_KEYS = [
     "serial",
@@ -50,6 +53,35 @@ def _async_get_diagnostics(
         device_info.update({visonic_device.id: to_json(visonic_device)})
     diag_data.update({"DEVICES": device_info})
 
+    # API executor
+    diag_data.update({"EXECUTOR": data.executor.metrics})
+
+    # Event history
+    diag_data.update({"EVENT HISTORY": len(data.event_history) if data.event_history is not None else None})
+
+    # Data freshness
+    diag_data.update(
+        {
+            "FRESHNESS": {
+                "data_age": data.data_age,
+                "consecutive_failures": data.consecutive_failures,
+                "serving_stale": data.serving_stale,
+            }
+        }
+    )
+
+    # Cloud hosts
+    diag_data.update({"HOSTS": data.hosts.as_dict()})
+
+    # Login governor
+    diag_data.update({"LOGIN GOVERNOR": async_get_login_governor(hass).as_dict(entry.data[CONF_EMAIL])})
+
+    # Traced spans, in Chrome trace format
+    diag_data.update({"TRACE": data.tracer.export()})
+
+    # Setup and refresh cost
+    diag_data.update({"PERFORMANCE": {**data.metrics.as_dict(), "import_times": IMPORT_TIMES}})
+
     return diag_data
 
 
@@ -1,14 +1,21 @@
 """Base visonic entity"""
 
+from __future__ import annotations
+
 import asyncio
 import logging
 from datetime import datetime
+from typing import TYPE_CHECKING, Callable
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_PANEL_ID, DOMAIN, SENSOR_TYPE_FRIENDLY_NAME
 
-from dateutil import tz
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from pyvisonicalarm.devices import Device as VisonicDevice
+if TYPE_CHECKING:
+    from pyvisonicalarm.devices import Device as VisonicDevice
 
-from .const import CONF_PANEL_ID, DOMAIN, PROCESS_TIMEOUT, SENSOR_TYPE_FRIENDLY_NAME
+    from .coordinator import VisonicAlarmCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,7 +24,7 @@ class BaseVisonicEntity:
     """Base for Visonic HA entity."""
 
     _device: VisonicDevice
-    coordinator: DataUpdateCoordinator
+    coordinator: VisonicAlarmCoordinator
 
     @staticmethod
     def get_base_name(device=None, partition_id: int = 0):
@@ -45,30 +52,37 @@ class BaseVisonicEntity:
     def convert_to_local_datetime(self, dt: datetime) -> datetime:  # pylint: disable=invalid-name
         """Convert datetime to local timezone"""
         utc = datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S")
-        utc = utc.replace(tzinfo=tz.tzutc())
-        return utc.astimezone(tz.tzlocal())
-
-    async def async_wait_for_process_success(self, coordinator, process_token) -> bool:
-        """Wait for process command to compelte."""
-        timeout = 0
-        while timeout <= PROCESS_TIMEOUT:
-            try:
-                process_status = await coordinator.get_process_status(process_token)
-                _LOGGER.debug("Process Status - %s", process_status)
-                # Do checks
-                if process_status.error:
-                    _LOGGER.error("Aborting process action due to process error. Error is %s", process_status.error)
-                    return False
-
-                # Set arming/disarming
-                if process_status.status == "succeeded":
-                    return True
-            except Exception as ex:  # pylint: disable=broad-exception-caught
-                _LOGGER.error("Unable to complete process action.  Error is %s", ex)
-                return False
-
-            await asyncio.sleep(2)
-            timeout += 2
+        return dt_util.as_local(utc.replace(tzinfo=dt_util.UTC))
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state and count writes for metrics."""
+        self.coordinator.metrics.state_writes += 1
+        if self.coordinator.load_test:
+            # Build the state as a write would, without it reaching the state machine
+            _ = self.available, self.state, self.extra_state_attributes
+            return
+        super().async_write_ha_state()
+
+    async def async_force_update(self, delay: int = 0, status_only: bool = False) -> bool:
+        """Force update from api via the shared coordinator refresh."""
+        _LOGGER.debug("Alarm update initiated by %s", self.name)
+        with self.coordinator.tracer.span("force_update", "refresh", root_sample_rate=0, status_only=status_only):
+            if delay:
+                await asyncio.sleep(delay)
+            return await self.coordinator.async_request_update(status_only=status_only)
+
+    async def async_wait_for_process_success(
+        self, coordinator, process_token, confirm: Callable[[], bool] | None = None
+    ) -> bool:
+        """Wait for process command to compelte.
+
+        Polled by the coordinator together with all other pending commands.  If a
+        confirm function is given, the command also completes once the status
+        shows success.
+        """
+        results = await coordinator.async_wait_for_processes([(process_token, confirm)])
+        return results[0]
 
     @property
     def device_info(self):
@@ -0,0 +1,131 @@
+"""Bounded panel event history for Visonic Alarm"""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from pyvisonicalarm.classes import Event as VisonicEvent
+
+
+def event_to_dict(event: VisonicEvent) -> dict:
+    """Convert api event to a compact dict."""
+    timestamp = dt_util.parse_datetime(event.datetime) if event.datetime else None
+    if timestamp and not timestamp.tzinfo:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+    return {
+        "id": event.id,
+        "type_id": event.type_id,
+        "label": event.label,
+        "description": event.description,
+        "appointment": event.appointment,
+        "datetime": timestamp.isoformat() if timestamp else event.datetime,
+        "timestamp": timestamp.timestamp() if timestamp else 0,
+        "device_type": event.device_type,
+        "zone": event.zone,
+        "partitions": event.partitions,
+        "name": event.name,
+    }
+
+
+def label_key(label: str | None) -> str:
+    """Return index key for event label."""
+    return (label or "").lower()
+
+
+class EventHistory:
+    """Fixed capacity ring buffer of panel events.
+
+    Events are indexed by zone and event label.  Index entries are dropped as
+    events are evicted, so memory and query cost depend only on capacity.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialise history."""
+        self.capacity = capacity
+        self._events: deque[dict] = deque()
+        self._by_zone: dict[int, deque[dict]] = {}
+        self._by_label: dict[str, deque[dict]] = {}
+        self._last_id = 0
+
+    def __len__(self) -> int:
+        """Return number of events held."""
+        return len(self._events)
+
+    def add_events(self, events: list[VisonicEvent]) -> list[dict]:
+        """Add events not already in history and return them."""
+        added = []
+        for event in sorted(events, key=lambda event: event.id):
+            if event.id <= self._last_id:
+                continue
+            self._last_id = event.id
+            record = event_to_dict(event)
+            self._append(record)
+            added.append(record)
+        return added
+
+    def _append(self, record: dict):
+        """Append record and evict oldest if at capacity."""
+        if len(self._events) >= self.capacity:
+            evicted = self._events.popleft()
+            self._unindex(self._by_zone, evicted["zone"], evicted)
+            self._unindex(self._by_label, label_key(evicted["label"]), evicted)
+
+        self._events.append(record)
+        self._by_zone.setdefault(record["zone"], deque()).append(record)
+        self._by_label.setdefault(label_key(record["label"]), deque()).append(record)
+
+    @staticmethod
+    def _unindex(index: dict, key, record: dict):
+        """Remove evicted record from an index.  It is always the oldest entry."""
+        entries = index.get(key)
+        if entries and entries[0] is record:
+            entries.popleft()
+            if not entries:
+                index.pop(key)
+
+    def query(
+        self,
+        zone: int | None = None,
+        label: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Return matching events, newest first."""
+        label = label_key(label) if label is not None else None
+        if zone is not None and label is not None:
+            # Scan the smaller index and filter on the other
+            by_zone = self._by_zone.get(zone, ())
+            by_label = self._by_label.get(label, ())
+            if len(by_zone) <= len(by_label):
+                candidates, extra = by_zone, ("label", label)
+            else:
+                candidates, extra = by_label, ("zone", zone)
+        elif zone is not None:
+            candidates, extra = self._by_zone.get(zone, ()), None
+        elif label is not None:
+            candidates, extra = self._by_label.get(label, ()), None
+        else:
+            candidates, extra = self._events, None
+
+        start_ts = start.timestamp() if start else None
+        end_ts = end.timestamp() if end else None
+
+        results = []
+        for record in reversed(candidates):
+            if start_ts is not None and record["timestamp"] < start_ts:
+                break
+            if end_ts is not None and record["timestamp"] > end_ts:
+                continue
+            if extra and (label_key(record["label"]) if extra[0] == "label" else record["zone"]) != extra[1]:
+                continue
+            results.append(record)
+            if limit and len(results) >= limit:
+                break
+        return results
@@ -0,0 +1,105 @@
+"""Bounded executor for Visonic API calls"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from homeassistant.exceptions import HomeAssistantError
+from pyvisonicalarm.exceptions import ConnectionTimeoutError
+
+from .profiler import VisonicProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VisonicExecutor:
+    """Thread pool dedicated to blocking Visonic API calls.
+
+    Keeps hung cloud calls from holding threads in the shared Home Assistant
+    executor and rejects new jobs once the queue limit is reached.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, profiler: VisonicProfiler | None = None) -> None:
+        """Initialise executor."""
+        self.profiler = profiler
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._pending = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._rejected = 0
+        self._abandoned = 0
+        self._peak_pending = 0
+
+    async def async_add_job(self, func: Callable, *args, deadline: float | None = None) -> Any:
+        """Run blocking function in the pool.
+
+        If the call takes longer than the deadline it is abandoned and
+        ConnectionTimeoutError raised.  Its worker thread is only freed once the
+        underlying request returns, so it counts against the queue limit until then.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HomeAssistantError(
+                    f"Visonic API queue is full ({self._pending} jobs pending).  Is the Visonic cloud responding?"
+                )
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+
+        try:
+            future = self._executor.submit(self._run, func, *args)
+        except RuntimeError:
+            self._job_done(None)
+            raise
+        # Released from the worker thread once the call returns, or is cancelled before it starts
+        future.add_done_callback(self._job_done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), deadline)
+        except TimeoutError as ex:
+            self._abandoned += 1
+            name = getattr(func, "__name__", str(func))
+            raise ConnectionTimeoutError(f"{name} did not respond within {deadline}s") from ex
+        finally:
+            if future.done() and not future.cancelled():
+                self._completed += 1
+
+    def _job_done(self, _future: Future | None) -> None:
+        """Release job from the queue limit."""
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, func: Callable, *args) -> Any:
+        """Run function in worker thread and track running count."""
+        with self._lock:
+            self._running += 1
+        try:
+            if self.profiler and self.profiler.active:
+                return self.profiler.profile_call(func, *args)
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """Return pool saturation metrics."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "queued": max(self._pending - self._running, 0),
+            "peak_pending": self._peak_pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "abandoned": self._abandoned,
+        }
+
+    def shutdown(self) -> None:
+        """Shutdown pool without waiting on hung calls."""
+        _LOGGER.debug("Shutting down Visonic API executor")
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,132 @@
+"""Latency based selection of Visonic cloud hosts"""
+
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pyvisonicalarm.exceptions import ConnectionTimeoutError
+
+from .const import HOST_LATENCY_SMOOTHING, HOST_RETRY_BASE, HOST_RETRY_MAX, HOST_SWITCH_MARGIN
+
+if TYPE_CHECKING:
+    from pyvisonicalarm import alarm as VisonicAlarm
+
+
+def parse_hosts(value: str) -> list[str]:
+    """Return ordered hosts from a comma or space separated string."""
+    return list(dict.fromkeys(host for host in re.split(r"[\s,]+", value or "") if host))
+
+
+def is_host_error(error: Exception) -> bool:
+    """Return if error is the host failing rather than the api rejecting the request.
+
+    Only timeouts and connection errors, which the api does not wrap, are host
+    errors.  Anything else, such as auth or local errors, would fail on every host.
+    """
+    if isinstance(error, ConnectionTimeoutError):
+        return True
+    # Imported on first error, as requests is only loaded with the api in the executor
+    from requests.exceptions import (  # pylint: disable=import-outside-toplevel
+        ConnectionError as RequestsConnectionError,
+        Timeout,
+    )
+
+    return isinstance(error, (RequestsConnectionError, Timeout))
+
+
+def probe_host(client: VisonicAlarm.Setup) -> float:
+    """Return seconds taken by the unauthenticated version request.  Blocking."""
+    start = time.perf_counter()
+    client.get_rest_versions()
+    return time.perf_counter() - start
+
+
+@dataclass
+class HostHealth:
+    """Latency and failures of a host."""
+
+    latency: float | None = None
+    failures: int = 0
+    down_until: float = 0
+
+    @property
+    def healthy(self) -> bool:
+        """Return if host is not resting after a failure."""
+        return self.down_until <= time.monotonic()
+
+
+class HostSelector:
+    """Choose the fastest healthy host from an ordered list.
+
+    Hosts with no measured latency rank after measured ones, ties go to the
+    earlier host, and the active host is kept unless another is faster by more
+    than the switch margin, so similar hosts do not cause flapping.
+    """
+
+    def __init__(self, hosts: list[str]) -> None:
+        """Initialise selector."""
+        self.hosts = hosts
+        self.health = {host: HostHealth() for host in hosts}
+        self.active = hosts[0]
+        self.probed: float = 0
+        self.switches = 0
+
+    def record_latency(self, host: str, latency: float):
+        """Record a successful probe of host."""
+        health = self.health[host]
+        if health.latency is None:
+            health.latency = latency
+        else:
+            health.latency += HOST_LATENCY_SMOOTHING * (latency - health.latency)
+        health.failures = 0
+        health.down_until = 0
+
+    def record_success(self, host: str):
+        """Record a successful request to host."""
+        self.health[host].failures = 0
+        self.health[host].down_until = 0
+
+    def record_failure(self, host: str):
+        """Record a failed request or probe and rest host with exponential backoff."""
+        health = self.health[host]
+        health.failures += 1
+        health.down_until = time.monotonic() + min(HOST_RETRY_BASE * 2 ** (health.failures - 1), HOST_RETRY_MAX)
+
+    def select(self) -> str:
+        """Return the host that should be active.  The active host if none are healthy."""
+        healthy = [host for host in self.hosts if self.health[host].healthy]
+        if not healthy:
+            return self.active
+
+        def rank(host: str) -> tuple:
+            latency = self.health[host].latency
+            return latency is None, latency or 0, self.hosts.index(host)
+
+        best = min(healthy, key=rank)
+        active_latency = self.health[self.active].latency
+        best_latency = self.health[best].latency
+        if (
+            self.active in healthy
+            and active_latency is not None
+            and (best_latency is None or best_latency > active_latency * (1 - HOST_SWITCH_MARGIN))
+        ):
+            return self.active
+        return best
+
+    def as_dict(self) -> dict:
+        """Return host state for diagnostics."""
+        return {
+            "active": self.active,
+            "switches": self.switches,
+            "hosts": {
+                host: {
+                    "latency": round(health.latency, 3) if health.latency is not None else None,
+                    "failures": health.failures,
+                    "healthy": health.healthy,
+                }
+                for host, health in self.health.items()
+            },
+        }
@@ -0,0 +1,37 @@
+"""Deferred loading of heavy dependencies"""
+
+import importlib
+import logging
+import sys
+import time
+from types import ModuleType
+
+from homeassistant.core import HomeAssistant
+
+from .const import API_MODULE, IMPORT_TIME_WARNING
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds taken to import modules, for diagnostics
+IMPORT_TIMES: dict[str, float] = {}
+
+
+async def async_import_api(hass: HomeAssistant) -> ModuleType:
+    """Import the api client on first use.
+
+    It pulls in requests, so is imported in the executor and kept off the
+    Home Assistant startup path.
+    """
+    if module := sys.modules.get(API_MODULE):
+        return module
+
+    start = time.perf_counter()
+    module = await hass.async_add_import_executor_job(importlib.import_module, API_MODULE)
+    IMPORT_TIMES[API_MODULE] = time.perf_counter() - start
+    if IMPORT_TIMES[API_MODULE] > IMPORT_TIME_WARNING:
+        _LOGGER.warning(
+            "Importing %s took %.3fs, expected under %ss", API_MODULE, IMPORT_TIMES[API_MODULE], IMPORT_TIME_WARNING
+        )
+    else:
+        _LOGGER.debug("Imported %s in %.3fs", API_MODULE, IMPORT_TIMES[API_MODULE])
+    return module
@@ -0,0 +1,200 @@
+"""Synthetic load test of entity setup and refresh fan-out"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from homeassistant.helpers.entity import Entity
+from pyvisonicalarm.classes import PanelInfo, Status
+from pyvisonicalarm.const import TEXT_OPENED
+from pyvisonicalarm.device_definitions import DEVICE_SUBTYPES, DEVICE_TYPES
+from pyvisonicalarm.devices import Device as VisonicDevice
+from pyvisonicalarm.devices import GenericDevice
+
+from . import alarm_control_panel, sensor, switch
+from .const import DATA, DOMAIN, LOAD_TEST_DEVICE_COUNTS, LOAD_TEST_PARTITION_COUNTS
+from .coordinator import VisonicAlarmCoordinator
+
+# Share of zones of each subtype, as seen on large installations
+ZONE_MIX = [
+    ("CONTACT", "ZONE", 50),
+    ("FLAT_PIR_SMART", "ZONE", 25),
+    ("BASIC_KEYFOB", "KEYFOB", 15),
+    ("GENERIC_PROXY_TAG", "TAG", 10),
+]
+
+# Share of zones changing between refreshes
+CHANGE_RATE = 0.1
+
+PLATFORMS = [alarm_control_panel, sensor, switch]
+
+
+def generate_device(number: int, subtype: str, device_type: str, partitions: int, rng: random.Random) -> dict:
+    """Return device payload as returned by the api."""
+    traits = {"location": {"name": f"Zone {number}"}}
+    if device_type == "ZONE":
+        traits["bypass"] = {"enabled": rng.random() < CHANGE_RATE}
+    if subtype == "FLAT_PIR_SMART":
+        reading_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        traits["meteo_info"] = {
+            "temperature": {"value": round(rng.uniform(15, 25), 1), "date": reading_date},
+            "brightness": {"value": rng.randint(0, 100), "date": reading_date},
+        }
+
+    return {
+        "id": number,
+        "device_number": number,
+        "device_type": device_type,
+        "subtype": subtype,
+        "zone_type": "PERIMETER" if device_type == "ZONE" else None,
+        "name": f"{subtype.title()} {number}",
+        "partitions": [number % partitions + 1],
+        "warnings": [{"type": TEXT_OPENED}] if subtype == "CONTACT" and rng.random() < CHANGE_RATE else [],
+        "traits": traits,
+    }
+
+
+def generate_payloads(devices: int, partitions: int, step: int = 0) -> tuple[PanelInfo, Status, list[VisonicDevice]]:
+    """Return panel info, status and devices of a synthetic panel.
+
+    Payloads are shaped as the api returns them and parsed by pyvisonicalarm's
+    own classes.  Each step changes a share of zones, as a refresh would.
+    """
+    rng = random.Random(step)
+    weights = [weight for _, _, weight in ZONE_MIX]
+    payloads = [generate_device(0, "VISONIC_PANEL", "CONTROL_PANEL", partitions, rng)]
+    # Zone subtypes stay fixed between steps so only values change
+    zone_types = random.Random(devices).choices(ZONE_MIX, weights=weights, k=devices - 1)
+    payloads.extend(
+        generate_device(number, subtype, device_type, partitions, rng)
+        for number, (subtype, device_type, _) in enumerate(zone_types, start=1)
+    )
+
+    panel_info = PanelInfo(
+        {
+            "serial": "LOADTEST",
+            "model": "PowerMaster 30",
+            "partitions": [
+                {"id": partition, "active": True, "exit_delay_time": 30, "name": f"Partition {partition}"}
+                for partition in range(1, partitions + 1)
+            ],
+            "features": {},
+        }
+    )
+    status = Status(
+        {
+            "connected": True,
+            "partitions": [
+                {"id": partition, "state": "DISARM", "status": "", "ready": rng.random() > CHANGE_RATE}
+                for partition in range(1, partitions + 1)
+            ],
+        }
+    )
+    devices = [
+        (DEVICE_SUBTYPES.get(payload["subtype"]) or DEVICE_TYPES.get(payload["device_type"]) or GenericDevice)(payload)
+        for payload in payloads
+    ]
+    return panel_info, status, devices
+
+
+async def async_setup_load_coordinator(
+    coordinator: VisonicAlarmCoordinator, devices: int, partitions: int
+) -> tuple[VisonicAlarmCoordinator, list[Entity]]:
+    """Return a coordinator holding a synthetic panel and its entities.
+
+    Entities are created by the platforms' own setup, but are not added to Home
+    Assistant, so nothing reaches the state machine or the api.
+    """
+    hass = coordinator.hass
+    entry = SimpleNamespace(
+        entry_id=f"{coordinator.config_entry.entry_id}_load_test",
+        unique_id=f"{coordinator.config_entry.unique_id}_load_test",
+        title=f"{coordinator.config_entry.title} load test",
+        data=coordinator.config_entry.data,
+        options=coordinator.config_entry.options,
+    )
+    load = VisonicAlarmCoordinator(hass, entry)
+    load.config_entry = entry
+    load.load_test = True
+    load.panel_info, load.status, load.devices = generate_payloads(devices, partitions)
+    load.status_updated = load.data_updated = time.monotonic()
+
+    entities: list[Entity] = []
+    # Platform setup finds its coordinator in hass.data and does not yield, so it is only there briefly
+    hass.data[DOMAIN][entry.entry_id] = {DATA: load}
+    try:
+        for platform in PLATFORMS:
+            await platform.async_setup_entry(hass, entry, entities.extend)
+    finally:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+
+    for entity in entities:
+        entity.hass = hass
+        load.async_add_listener(entity._handle_coordinator_update)  # pylint: disable=protected-access
+    return load, entities
+
+
+async def async_run_load(coordinator: VisonicAlarmCoordinator, devices: int, partitions: int, refreshes: int) -> dict:
+    """Measure entity setup and refresh fan-out of one synthetic panel size."""
+    load, entities = await async_setup_load_coordinator(coordinator, devices, partitions)
+    try:
+        # Adding entities writes each state once
+        for entity in entities:
+            entity.async_write_ha_state()
+        initial_writes = load.metrics.state_writes
+
+        for step in range(1, refreshes + 1):
+            load.panel_info, load.status, load.devices = generate_payloads(devices, partitions, step)
+            load.status_updated = load.data_updated = time.monotonic()
+            load.data_version += 1
+            load.update_statistics()
+            load.async_update_listeners()
+            # Let Home Assistant run between refreshes
+            await asyncio.sleep(0)
+        metrics = load.metrics.as_dict()
+    finally:
+        load.executor.shutdown()
+
+    # Separate pass as tracing allocations slows everything it measures
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        load, entities = await async_setup_load_coordinator(coordinator, devices, partitions)
+        load.async_update_listeners()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+        load.executor.shutdown()
+
+    return {
+        "devices": devices,
+        "partitions": partitions,
+        "entities": len(entities),
+        "entity_setup": metrics["entity_setup"],
+        "peak_memory": peak_memory,
+        "refresh_cpu_time_avg": metrics["fanout_cpu_time_avg"],
+        "refresh_cpu_time_max": metrics["max_fanout_cpu_time"],
+        "initial_state_writes": initial_writes,
+        "state_writes_per_refresh": (metrics["state_writes"] - initial_writes) / refreshes if refreshes else 0,
+    }
+
+
+async def async_load_test(coordinator: VisonicAlarmCoordinator, refreshes: int) -> dict:
+    """Run the load test at every size with the panel's options.
+
+    Runs in the event loop, as entity updates do, yielding between refreshes.
+    """
+    results = []
+    for devices in LOAD_TEST_DEVICE_COUNTS:
+        for partitions in LOAD_TEST_PARTITION_COUNTS:
+            results.append(await async_run_load(coordinator, devices, partitions, refreshes))
+            await asyncio.sleep(0)
+    return {"panel": coordinator.config_entry.title, "refreshes": refreshes, "results": results}
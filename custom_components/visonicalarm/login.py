@@ -0,0 +1,111 @@
+"""Process wide governor of Visonic account logins"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from pyvisonicalarm.exceptions import LoginTemporaryBlockedError
+
+from .const import LOGIN_BLOCK_DEFAULT, LOGIN_BUCKET_SIZE, LOGIN_GOVERNOR, LOGIN_REFILL_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+BLOCK_REMAINING = re.compile(r"\((\d+) seconds remaining\)")
+BLOCK_STATUS = "420 Client Error"
+
+
+def is_login_block(error: Exception) -> bool:
+    """Return if error is the cloud blocking logins.
+
+    pyvisonicalarm raises KeyError while building its block error, so the
+    HTTP 420 it was handling is also recognised.
+    """
+    return isinstance(error, LoginTemporaryBlockedError) or (
+        isinstance(error, KeyError) and BLOCK_STATUS in str(error.__cause__ or error.__context__)
+    )
+
+
+@callback
+def async_get_login_governor(hass: HomeAssistant) -> "LoginGovernor":
+    """Return the login governor, creating it if needed.
+
+    It is kept for the life of Home Assistant, so a block is remembered across
+    reloads of config entries.
+    """
+    if LOGIN_GOVERNOR not in hass.data:
+        hass.data[LOGIN_GOVERNOR] = LoginGovernor(hass)
+    return hass.data[LOGIN_GOVERNOR]
+
+
+class LoginGovernor:
+    """Limit logins from all config entries and config flows.
+
+    Each account has a token bucket of login attempts.  Concurrent logins with
+    the same key share one attempt, and once the cloud blocks an account no
+    further attempts are made until the block expires.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise governor."""
+        self._hass = hass
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    def blocked_for(self, account: str) -> float:
+        """Return seconds until account block expires."""
+        return max(self._blocked_until.get(account, 0) - time.monotonic(), 0)
+
+    def get_tokens(self, account: str) -> float:
+        """Return login attempts available to account."""
+        tokens, updated = self._buckets.get(account, (LOGIN_BUCKET_SIZE, time.monotonic()))
+        return min(tokens + (time.monotonic() - updated) / LOGIN_REFILL_INTERVAL, LOGIN_BUCKET_SIZE)
+
+    def _take_token(self, account: str):
+        """Take a login attempt from account bucket or raise if none are left."""
+        if blocked_for := self.blocked_for(account):
+            raise LoginTemporaryBlockedError(f"Login blocked for another {blocked_for:.0f}s")
+
+        tokens = self.get_tokens(account)
+        if tokens < 1:
+            raise LoginTemporaryBlockedError(
+                f"Too many logins, next attempt allowed in {(1 - tokens) * LOGIN_REFILL_INTERVAL:.0f}s"
+            )
+        self._buckets[account] = (tokens - 1, time.monotonic())
+
+    async def async_login(self, account: str, key: str, login: Callable[[], Awaitable[Any]]) -> Any:
+        """Run login, or join one already running for key."""
+        if task := self._in_flight.get(key):
+            _LOGGER.debug("Joining login in progress for %s", key)
+            return await asyncio.shield(task)
+
+        self._take_token(account)
+        task = self._hass.async_create_task(self._async_login(account, login))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _async_login(self, account: str, login: Callable[[], Awaitable[Any]]) -> Any:
+        """Run login and remember any block."""
+        try:
+            return await login()
+        except Exception as ex:
+            if not is_login_block(ex):
+                raise
+            match = BLOCK_REMAINING.search(str(ex))
+            block = int(match.group(1)) if match else LOGIN_BLOCK_DEFAULT
+            self._blocked_until[account] = time.monotonic() + block
+            _LOGGER.warning("Login temporarily blocked by Visonic.  No logins will be attempted for %ss", block)
+            if isinstance(ex, LoginTemporaryBlockedError):
+                raise
+            raise LoginTemporaryBlockedError(f"Login blocked for another {block}s") from ex
+
+    def as_dict(self, account: str) -> dict:
+        """Return governor state of account for diagnostics."""
+        return {
+            "tokens": round(self.get_tokens(account), 2),
+            "blocked_for": round(self.blocked_for(account)),
+        }
@@ -0,0 +1,63 @@
+"""Performance metrics for Visonic Alarm"""
+
+import resource
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class VisonicAlarmMetrics:
+    """Data store for setup and refresh cost metrics.
+
+    Kept cheap enough to be always on.  Values are plain types so they can be
+    exported from diagnostics and compared across releases.
+    """
+
+    entity_setup: dict[str, dict] = field(default_factory=dict)
+    refresh_count: int = 0
+    refresh_wall_time: float = 0
+    last_refresh_wall_time: float = 0
+    fanout_count: int = 0
+    fanout_cpu_time: float = 0
+    last_fanout_cpu_time: float = 0
+    max_fanout_cpu_time: float = 0
+    state_writes: int = 0
+    last_fanout_state_writes: int = 0
+
+    def record_entity_setup(self, platform: str, entities: int, start: float):
+        """Record entity creation cost for a platform, from a perf_counter start."""
+        self.entity_setup[platform] = {
+            "entities": entities,
+            "duration": time.perf_counter() - start,
+        }
+
+    def record_refresh(self, start: float):
+        """Record api refresh duration, from a perf_counter start."""
+        self.refresh_count += 1
+        self.last_refresh_wall_time = time.perf_counter() - start
+        self.refresh_wall_time += self.last_refresh_wall_time
+
+    def record_fanout(self, cpu_start: float, writes_start: int):
+        """Record entity update fan-out cost, from a process_time start."""
+        self.fanout_count += 1
+        self.last_fanout_cpu_time = time.process_time() - cpu_start
+        self.fanout_cpu_time += self.last_fanout_cpu_time
+        self.max_fanout_cpu_time = max(self.max_fanout_cpu_time, self.last_fanout_cpu_time)
+        self.last_fanout_state_writes = self.state_writes - writes_start
+
+    def as_dict(self) -> dict:
+        """Return metrics as a dict."""
+        return {
+            "entity_setup": self.entity_setup,
+            "refresh_count": self.refresh_count,
+            "refresh_wall_time_avg": self.refresh_wall_time / self.refresh_count if self.refresh_count else 0,
+            "last_refresh_wall_time": self.last_refresh_wall_time,
+            "fanout_count": self.fanout_count,
+            "fanout_cpu_time_avg": self.fanout_cpu_time / self.fanout_count if self.fanout_count else 0,
+            "last_fanout_cpu_time": self.last_fanout_cpu_time,
+            "max_fanout_cpu_time": self.max_fanout_cpu_time,
+            "state_writes": self.state_writes,
+            "last_fanout_state_writes": self.last_fanout_state_writes,
+            # Peak RSS of the whole Home Assistant process (kB on Linux)
+            "peak_memory": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
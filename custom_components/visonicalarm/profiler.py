@@ -0,0 +1,150 @@
+"""On demand profiling of refresh and command paths"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    import cProfile
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VisonicProfiler:
+    """Profile event loop and api executor activity for a number of refreshes or a duration.
+
+    Nothing is hooked in or imported while inactive, callers only check the active flag.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialise profiler."""
+        self._hass = hass
+        self._name = name
+        self._profile: cProfile.Profile | None = None
+        self._call_profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._cycles_remaining = 0
+        self._top = 0
+        self._cancel_timer = None
+        self.active = False
+
+    @callback
+    def async_start(self, cycles: int = 0, duration: float = 0, top: int = 30) -> bool:
+        """Start profiling for a number of refresh cycles or a duration in seconds.
+
+        Return if started, rather than already running.
+        """
+        if self.active:
+            _LOGGER.warning("Profiler for %s is already running", self._name)
+            return False
+
+        import cProfile  # pylint: disable=import-outside-toplevel
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as ex:
+            # Only one profiler can be active on python 3.12+, including Home Assistant's own
+            raise HomeAssistantError(
+                "Another profiler is already running, stop it or profile one panel at a time"
+            ) from ex
+
+        self._cycles_remaining = cycles
+        self._top = top
+        self._call_profiles = []
+        self._profile = profile
+        self.active = True
+        if duration:
+            self._cancel_timer = async_call_later(self._hass, duration, self._async_timer_expired)
+        _LOGGER.info("Profiler started for %s", self._name)
+
+    def profile_call(self, func, *args):
+        """Run a blocking call under its own profile.  Called from executor threads."""
+        import cProfile  # pylint: disable=import-outside-toplevel
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Only one profiler can be active on python 3.12+, where it covers all threads
+            return func(*args)
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._call_profiles.append(profile)
+
+    @callback
+    def async_cycle_complete(self):
+        """Count a completed refresh cycle."""
+        if not self.active or not self._cycles_remaining:
+            return
+        self._cycles_remaining -= 1
+        if not self._cycles_remaining:
+            self._hass.async_create_task(self.async_stop())
+
+    async def _async_timer_expired(self, _now):
+        """Stop profiling after duration."""
+        self._cancel_timer = None
+        await self.async_stop()
+
+    @callback
+    def async_cancel(self):
+        """Stop profiling without writing results."""
+        if not self.active:
+            return
+
+        self.active = False
+        self._profile.disable()
+        self._profile = None
+        if self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+        with self._lock:
+            self._call_profiles = []
+
+    async def async_stop(self):
+        """Stop profiling and write results to the config directory."""
+        if not self.active:
+            return
+
+        self.active = False
+        self._profile.disable()
+        if self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+
+        profile, self._profile = self._profile, None
+        with self._lock:
+            call_profiles, self._call_profiles = self._call_profiles, []
+
+        path = await self._hass.async_add_executor_job(self._write_results, profile, call_profiles)
+        _LOGGER.info("Profiler stopped for %s.  Results written to %s", self._name, path)
+
+    def _write_results(self, profile: cProfile.Profile, call_profiles: list[cProfile.Profile]) -> str:
+        """Write pstats and a readable summary."""
+        import io  # pylint: disable=import-outside-toplevel
+        import pstats  # pylint: disable=import-outside-toplevel
+
+        stats = pstats.Stats(profile)
+        for call_profile in call_profiles:
+            stats.add(call_profile)
+
+        base_path = self._hass.config.path(f"{self._name}_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        stats.dump_stats(f"{base_path}.pstats")
+
+        summary = io.StringIO()
+        stats.stream = summary
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self._top)
+        with open(f"{base_path}.txt", "w", encoding="utf-8") as file:
+            file.write(summary.getvalue())
+
+        return f"{base_path}.pstats"
@@ -0,0 +1,99 @@
+"""Shared poll scheduler for Visonic Alarm config entries"""
+
+import asyncio
+import logging
+import random
+import time
+from functools import partial
+
+from homeassistant.core import HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import MAX_CONCURRENT_REFRESHES, POLL_JITTER, SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> "PollScheduler":
+    """Return the shared scheduler, creating it if needed."""
+    if SCHEDULER not in hass.data:
+        hass.data[SCHEDULER] = PollScheduler(hass)
+    return hass.data[SCHEDULER]
+
+
+class PollScheduler:
+    """Schedule polls of all panels spread evenly across their interval.
+
+    Each coordinator polls at its own interval, offset from the others by an equal
+    share of it plus a little jitter.  Refreshes in flight are capped so panels
+    never all hit the cloud at once.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise scheduler."""
+        self._hass = hass
+        self._coordinators = []
+        self._cancel_timers = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REFRESHES)
+        self._anchor = time.monotonic()
+
+    @callback
+    def async_add(self, coordinator):
+        """Add coordinator and respread all polls."""
+        self._coordinators.append(coordinator)
+        for scheduled in self._coordinators:
+            self._async_schedule(scheduled)
+
+    @callback
+    def async_remove(self, coordinator):
+        """Remove coordinator and respread remaining polls."""
+        if cancel := self._cancel_timers.pop(coordinator, None):
+            cancel()
+        if coordinator in self._coordinators:
+            self._coordinators.remove(coordinator)
+        for scheduled in self._coordinators:
+            self._async_schedule(scheduled)
+        if not self._coordinators:
+            self._hass.data.pop(SCHEDULER, None)
+
+    def get_next_delay(self, coordinator) -> float:
+        """Return seconds until the coordinator's next slot."""
+        interval = coordinator.scan_interval
+        count = len(self._coordinators)
+        offset = interval * self._coordinators.index(coordinator) / count
+
+        delay = interval - ((time.monotonic() - self._anchor - offset) % interval)
+        if delay < interval / 2 and coordinator.last_update_success and coordinator.status_age < interval / 2:
+            # Just polled, so skip this slot rather than poll twice in quick succession
+            delay += interval
+
+        jitter = random.uniform(-POLL_JITTER, POLL_JITTER) * interval / count
+        # Pause polling while the account is blocked from logging in
+        return max(delay + jitter, coordinator.login_blocked_for, 1)
+
+    @callback
+    def _async_schedule(self, coordinator):
+        """Schedule next poll for coordinator."""
+        if cancel := self._cancel_timers.pop(coordinator, None):
+            cancel()
+        delay = self.get_next_delay(coordinator)
+        _LOGGER.debug("Next poll of %s in %.1fs", coordinator.name, delay)
+        self._cancel_timers[coordinator] = async_call_later(
+            self._hass, delay, HassJob(partial(self._async_poll, coordinator), cancel_on_shutdown=True)
+        )
+
+    async def _async_poll(self, coordinator, _now):
+        """Poll coordinator within the in-flight cap.
+
+        Polls go through the coordinator's shared refresh, so join any refresh
+        already requested rather than run alongside it.  They are skipped while a
+        status check is scheduled for the end of an exit or entry delay, as that
+        check will pick up the change.
+        """
+        self._cancel_timers.pop(coordinator, None)
+        async with self._semaphore:
+            if coordinator in self._coordinators and not coordinator.delay_check_pending:
+                await coordinator.async_request_update()
+        if coordinator in self._coordinators:
+            self._async_schedule(coordinator)
@@ -1,15 +1,27 @@
 """
 Interfaces with the Visonic Alarm sensors.
 """
-import asyncio
 import logging
+import time
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
-from homeassistant.const import LIGHT_LUX, STATE_CLOSED, STATE_OPEN, UnitOfTemperature
+from homeassistant.const import LIGHT_LUX, STATE_CLOSED, STATE_OPEN, EntityCategory, UnitOfTemperature
 from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DATA, DOMAIN, SUPPORTED_SENSORS
+from .const import (
+    DATA,
+    DOMAIN,
+    KEYFOB_SENSORS,
+    STATISTIC_TYPES,
+    STAT_RATE,
+    SUMMARY_TYPES,
+    SUPPORTED_SENSORS,
+    ZONE_ENTITY_BRIGHTNESS,
+    ZONE_ENTITY_KEYFOB,
+    ZONE_ENTITY_STATE,
+    ZONE_ENTITY_TEMPERATURE,
+)
 from .entity import BaseVisonicEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -18,6 +30,7 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the Visonic Alarm platform."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA]
+    start = time.perf_counter()
     sensors = []
 
     for device in coordinator.devices:
@@ -36,15 +49,42 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     sensors.append(VisonicStatusSensor(coordinator, coordinator.status, partition_id=partition.id))
                 continue
 
-            sensors.append(VisonicAlarmSensor(coordinator, device, "state"))
+            if device.subtype in KEYFOB_SENSORS:
+                if ZONE_ENTITY_KEYFOB in coordinator.zone_entities:
+                    sensors.append(VisonicAlarmSensor(coordinator, device, "state"))
+                continue
+
+            if ZONE_ENTITY_STATE in coordinator.zone_entities:
+                sensors.append(VisonicAlarmSensor(coordinator, device, "state"))
 
-            if hasattr(device, "temperature"):
+            if hasattr(device, "temperature") and ZONE_ENTITY_TEMPERATURE in coordinator.zone_entities:
                 sensors.append(VisonicAlarmTemperatureSensor(coordinator, device, "temperature"))
 
-            if hasattr(device, "brightness"):
+            if hasattr(device, "brightness") and ZONE_ENTITY_BRIGHTNESS in coordinator.zone_entities:
                 sensors.append(VisonicAlarmLuxSensor(coordinator, device, "brightness"))
 
+            if coordinator.statistics_sensors and coordinator.statistics_window:
+                for measurement, zone_entity in [
+                    ("temperature", ZONE_ENTITY_TEMPERATURE),
+                    ("brightness", ZONE_ENTITY_BRIGHTNESS),
+                ]:
+                    if hasattr(device, measurement) and zone_entity in coordinator.zone_entities:
+                        for statistic in STATISTIC_TYPES:
+                            sensors.append(
+                                VisonicAlarmStatisticSensor(coordinator, device, measurement, statistic=statistic)
+                            )
+
+    # Partition zone summary sensors
+    if coordinator.summary_sensors:
+        for partition in coordinator.status.partitions:
+            for summary_type in SUMMARY_TYPES:
+                sensors.append(VisonicZoneSummarySensor(coordinator, partition.id, summary_type))
+
+    # Poll metadata sensor
+    sensors.append(VisonicLastUpdateSensor(coordinator))
+
     async_add_entities(sensors)
+    coordinator.metrics.record_entity_setup("sensor", len(sensors), start)
 
 
 class VisonicAlarmSensor(BaseVisonicEntity, CoordinatorEntity, SensorEntity):
@@ -101,13 +141,6 @@ class VisonicAlarmSensor(BaseVisonicEntity, CoordinatorEntity, SensorEntity):
         defined_attrs = ["location", "name", "device_type", "subtype", "zone_type"]
         return self.get_attrs(defined_attrs)
 
-    async def async_force_update(self, delay: int = 0):
-        """Force update of sensor."""
-        _LOGGER.debug("Alarm update initiated by %s", self.name)
-        if delay:
-            await asyncio.sleep(delay)
-        await self.coordinator.async_refresh()
-
     @callback
     def _handle_coordinator_update(self) -> None:
         """Get the latest data"""
@@ -119,7 +152,64 @@ class VisonicAlarmSensor(BaseVisonicEntity, CoordinatorEntity, SensorEntity):
             _LOGGER.warning("Could not update the device information: %s", error)
 
 
-class VisonicAlarmTemperatureSensor(VisonicAlarmSensor):
+class VisonicAlarmMeasurementSensor(VisonicAlarmSensor):
+    """Base class for measurement sensors which only write state on meaningful change."""
+
+    # Rolling statistics are already recorded as the sensor state history
+    _unrecorded_attributes = frozenset(STATISTIC_TYPES)
+
+    _last_written_value: float | None = None
+    _last_written_time: float = 0
+    _last_written_available: bool | None = None
+
+    def deadband_exceeded(self, old_value: float, new_value: float) -> bool:
+        """Return if change in value is large enough to write state."""
+        return old_value != new_value
+
+    def should_write_state(self) -> bool:
+        """Return if state should be written.
+
+        Writes are suppressed while the value stays within the deadband, even if the
+        reading timestamp has changed, up to the max suppress interval.  This keeps
+        statistics correct as a value is always recorded at least that often.
+        """
+        if self.available != self._last_written_available or self._last_written_value is None:
+            return True
+
+        try:
+            value = self.native_value
+        except (AttributeError, TypeError, ValueError):
+            return True
+
+        if self.deadband_exceeded(self._last_written_value, value):
+            return True
+
+        return time.monotonic() - self._last_written_time >= self.coordinator.max_suppress_interval
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state and record what was written."""
+        super().async_write_ha_state()
+        self._last_written_available = self.available
+        self._last_written_time = time.monotonic()
+        try:
+            self._last_written_value = self.native_value
+        except (AttributeError, TypeError, ValueError):
+            self._last_written_value = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Get the latest data"""
+        try:
+            self._device = self.coordinator.get_device_by_id(self._device.id)
+            if self.should_write_state():
+                self.async_write_ha_state()
+
+        except OSError as error:
+            _LOGGER.warning("Could not update the device information: %s", error)
+
+
+class VisonicAlarmTemperatureSensor(VisonicAlarmMeasurementSensor):
     """Class for temperature sensor."""
 
     @property
@@ -137,6 +227,13 @@ class VisonicAlarmTemperatureSensor(VisonicAlarmSensor):
         """Return the state of the entity."""
         return float(self._device.temperature)
 
+    def deadband_exceeded(self, old_value: float, new_value: float) -> bool:
+        """Return if temperature has moved by more than the deadband."""
+        if not self.coordinator.temperature_deadband:
+            return old_value != new_value
+        # Rounded so a step equal to the deadband is not lost to float error
+        return round(abs(new_value - old_value), 3) >= self.coordinator.temperature_deadband
+
     @property
     def native_unit_of_measurement(self):
         """Return unit of temperature"""
@@ -147,10 +244,11 @@ class VisonicAlarmTemperatureSensor(VisonicAlarmSensor):
         attrs = {}
         if hasattr(self._device, "temperature_last_updated"):
             attrs["last_updated"] = self.convert_to_local_datetime(self._device.temperature_last_updated)
+        attrs.update(self.coordinator.get_statistics(self._device.id, "temperature"))
         return attrs
 
 
-class VisonicAlarmLuxSensor(VisonicAlarmSensor):
+class VisonicAlarmLuxSensor(VisonicAlarmMeasurementSensor):
     """Class for a brightness sensor"""
 
     @property
@@ -168,6 +266,14 @@ class VisonicAlarmLuxSensor(VisonicAlarmSensor):
         """Return the state of the sensor."""
         return float(self._device.brightness)
 
+    def deadband_exceeded(self, old_value: float, new_value: float) -> bool:
+        """Return if brightness has moved by more than the deadband percentage."""
+        if not self.coordinator.lux_deadband:
+            return old_value != new_value
+        return round(abs(new_value - old_value), 3) >= round(
+            max(abs(old_value), 1) * self.coordinator.lux_deadband / 100, 3
+        )
+
     @property
     def native_unit_of_measurement(self):
         """Return unit of brightness"""
@@ -178,9 +284,60 @@ class VisonicAlarmLuxSensor(VisonicAlarmSensor):
         attrs = {}
         if hasattr(self._device, "brightness_last_updated"):
             attrs["last_updated"] = self.convert_to_local_datetime(self._device.brightness_last_updated)
+        attrs.update(self.coordinator.get_statistics(self._device.id, "brightness"))
         return attrs
 
 
+class VisonicAlarmStatisticSensor(VisonicAlarmSensor):
+    """Class for a rolling statistic of a temperature or brightness reading."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, device, sensor_type=None, statistic: str = None):
+        """Initialise sensor"""
+        super().__init__(coordinator, device, sensor_type)
+        self._statistic = statistic
+
+    @property
+    def name(self):
+        """Return the name of the sensor"""
+        return f"{super().name} {self._statistic.replace('_', ' ').capitalize()}"
+
+    @property
+    def unique_id(self):
+        """Return unique id."""
+        return f"{super().unique_id}-{self._statistic}"
+
+    @property
+    def icon(self):
+        """Return icon"""
+        return "mdi:chart-line"
+
+    @property
+    def device_class(self):
+        """Return device class."""
+        if self._statistic == STAT_RATE:
+            return None
+        if self._sensor_type == "temperature":
+            return SensorDeviceClass.TEMPERATURE
+        return SensorDeviceClass.ILLUMINANCE
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return unit of statistic"""
+        unit = UnitOfTemperature.CELSIUS if self._sensor_type == "temperature" else LIGHT_LUX
+        return f"{unit}/h" if self._statistic == STAT_RATE else unit
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.coordinator.get_statistics(self._device.id, self._sensor_type).get(self._statistic)
+
+    @property
+    def extra_state_attributes(self):
+        return {}
+
+
 class VisonicStatusSensor(VisonicAlarmSensor):
     """Class for status sensor."""
 
@@ -204,12 +361,6 @@ class VisonicStatusSensor(VisonicAlarmSensor):
     def extra_state_attributes(self):
         return {}
 
-    async def async_force_update(self, delay: int = 0):
-        _LOGGER.debug("Alarm update initiated by %s", self.name)
-        if delay:
-            await asyncio.sleep(delay)
-        await self.coordinator.async_refresh()
-
     @callback
     def _handle_coordinator_update(self) -> None:
         """Get the latest data"""
@@ -219,3 +370,93 @@ class VisonicStatusSensor(VisonicAlarmSensor):
 
         except OSError as error:
             _LOGGER.warning("Could not update the device information: %s", error)
+
+
+class VisonicLastUpdateSensor(BaseVisonicEntity, CoordinatorEntity, SensorEntity):
+    """Class for last update diagnostic sensor.
+
+    Poll metadata lives here rather than on the alarm panel entity, so the panel
+    only writes state when the alarm state changes.  This sensor changes on every
+    poll, so is disabled by default.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    # Freshness changes on every poll, so is not worth keeping in history
+    _unrecorded_attributes = frozenset({"data_age", "consecutive_failures", "serving_stale"})
+
+    def __init__(self, coordinator):
+        """Initialise sensor"""
+        super().__init__(coordinator)
+        self._device = None
+
+    @property
+    def name(self):
+        """Return the name of the sensor"""
+        return "Alarm Panel Last Update"
+
+    @property
+    def unique_id(self):
+        """Return unique id."""
+        return f"{DOMAIN}-{self.coordinator.panel_info.serial}-last_update"
+
+    @property
+    def native_value(self):
+        """Return the state of the entity."""
+        return self.coordinator.last_update.astimezone()
+
+    @property
+    def extra_state_attributes(self):
+        """Return data freshness."""
+        data_age = self.coordinator.data_age
+        return {
+            "data_age": round(data_age) if data_age is not None else None,
+            "consecutive_failures": self.coordinator.consecutive_failures,
+            "serving_stale": self.coordinator.serving_stale,
+        }
+
+
+class VisonicZoneSummarySensor(BaseVisonicEntity, CoordinatorEntity, SensorEntity):
+    """Class for partition zone summary sensor.
+
+    Gives a count of open, bypassed or trouble zones with the zones as an
+    attribute, so large panels do not need an entity per zone.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, partition_id: int, summary_type: str):
+        """Initialise sensor"""
+        super().__init__(coordinator)
+        self._device = None
+        self._partition_id = partition_id
+        self._summary_type = summary_type
+
+    @property
+    def name(self):
+        """Return the name of the sensor"""
+        if len(self.coordinator.status.partitions) > 1:
+            partition = self.coordinator.get_partition_info_by_id(self._partition_id)
+            return f"Partition {partition.name} {self._summary_type.capitalize()} Zones"
+        return f"{self._summary_type.capitalize()} Zones"
+
+    @property
+    def unique_id(self):
+        """Return unique id."""
+        return f"{DOMAIN}-{self.coordinator.panel_info.serial}-{self._partition_id}-{self._summary_type}-zones"
+
+    @property
+    def icon(self):
+        """Return icon"""
+        return "mdi:format-list-bulleted"
+
+    @property
+    def native_value(self):
+        """Return the state of the entity."""
+        return len(self.coordinator.get_zone_summary(self._partition_id)[self._summary_type])
+
+    @property
+    def extra_state_attributes(self):
+        """Return zones in summary."""
+        return {"zones": self.coordinator.get_zone_summary(self._partition_id)[self._summary_type]}
@@ -0,0 +1,392 @@
+"""
+Services for Visonic Alarm.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+import voluptuous as vol
+from homeassistant.const import CONF_CODE
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .alarm_control_panel import ACTION_TARGET_STATE, AlarmAction
+from .const import (
+    ALARM_PANELS,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CYCLES,
+    ATTR_DURATION,
+    ATTR_END,
+    ATTR_EVENT_TYPE,
+    ATTR_FAIL_ON_REGRESSION,
+    ATTR_LIMIT,
+    ATTR_MODE,
+    ATTR_PARTITIONS,
+    ATTR_REFRESHES,
+    ATTR_SAVE_BASELINE,
+    ATTR_START,
+    ATTR_THRESHOLD,
+    ATTR_TOP,
+    ATTR_ZONE,
+    CONF_PANEL_ID,
+    DATA,
+    DEFAULT_BENCHMARK_THRESHOLD,
+    DEFAULT_LOAD_TEST_REFRESHES,
+    DOMAIN,
+    SERVICE_ARM_PARTITIONS,
+    SERVICE_BENCHMARK,
+    SERVICE_DISARM_PARTITIONS,
+    SERVICE_EXPORT_TRACE,
+    SERVICE_GET_EVENTS,
+    SERVICE_LOAD_TEST,
+    SERVICE_PROFILE,
+)
+from .coordinator import VisonicAlarmCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+ARM_MODES = {
+    "away": AlarmAction.ARM_AWAY,
+    "home": AlarmAction.ARM_HOME,
+}
+
+DISARM_PARTITIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_PARTITIONS): vol.All(cv.ensure_list, [vol.Coerce(int)]),
+        vol.Optional(CONF_CODE): cv.string,
+    }
+)
+
+ARM_PARTITIONS_SCHEMA = DISARM_PARTITIONS_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_MODE, default="away"): vol.In(ARM_MODES),
+    }
+)
+
+GET_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_ZONE): vol.Coerce(int),
+        vol.Optional(ATTR_EVENT_TYPE): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_LIMIT, default=50): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Exclusive(ATTR_CYCLES, "profile_length"): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Exclusive(ATTR_DURATION, "profile_length"): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+        vol.Optional(ATTR_TOP, default=30): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+EXPORT_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+BENCHMARK_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SAVE_BASELINE, default=False): cv.boolean,
+        vol.Optional(ATTR_THRESHOLD, default=DEFAULT_BENCHMARK_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_FAIL_ON_REGRESSION, default=False): cv.boolean,
+    }
+)
+
+LOAD_TEST_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REFRESHES, default=DEFAULT_LOAD_TEST_REFRESHES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+def get_coordinators(hass: HomeAssistant, config_entry_id: str | None = None) -> list[VisonicAlarmCoordinator]:
+    """Return coordinators, optionally only for a config entry."""
+    return [
+        entry_data[DATA]
+        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+        if config_entry_id in [None, entry_id]
+    ]
+
+
+def query_events(hass: HomeAssistant, config_entry_id: str | None = None, **filters) -> list[dict]:
+    """Query event history across panels, newest first."""
+    events = []
+    for coordinator in get_coordinators(hass, config_entry_id):
+        if coordinator.event_history is None:
+            continue
+        events.extend(
+            {**event, "panel": coordinator.config_entry.title} for event in coordinator.event_history.query(**filters)
+        )
+
+    events.sort(key=lambda event: event["timestamp"], reverse=True)
+    if filters.get("limit"):
+        events = events[: filters["limit"]]
+    return events
+
+
+def write_json(path: str, data: dict):
+    """Write data to path as json.  Blocking."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+
+
+async def async_setup_services(hass: HomeAssistant):
+    """Set up services for the integration."""
+    if hass.services.has_service(DOMAIN, SERVICE_ARM_PARTITIONS):
+        return
+
+    async def async_arm_partitions(call: ServiceCall) -> ServiceResponse:
+        """Arm several partitions together."""
+        return await async_action_partitions(hass, call, ARM_MODES[call.data[ATTR_MODE]])
+
+    async def async_disarm_partitions(call: ServiceCall) -> ServiceResponse:
+        """Disarm several partitions together."""
+        return await async_action_partitions(hass, call, AlarmAction.DISARM)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ARM_PARTITIONS,
+        async_arm_partitions,
+        schema=ARM_PARTITIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DISARM_PARTITIONS,
+        async_disarm_partitions,
+        schema=DISARM_PARTITIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_get_events(call: ServiceCall) -> ServiceResponse:
+        """Return panel events from history."""
+        return {
+            "events": query_events(
+                hass,
+                call.data.get(ATTR_CONFIG_ENTRY_ID),
+                zone=call.data.get(ATTR_ZONE),
+                label=call.data.get(ATTR_EVENT_TYPE),
+                start=call.data.get(ATTR_START),
+                end=call.data.get(ATTR_END),
+                limit=call.data[ATTR_LIMIT],
+            )
+        }
+
+    async def async_profile(call: ServiceCall):
+        """Profile the next refresh cycles or a duration."""
+        cycles = call.data.get(ATTR_CYCLES, 0 if call.data.get(ATTR_DURATION) else 3)
+        started = []
+        try:
+            for coordinator in get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+                if coordinator.profiler.async_start(cycles, call.data.get(ATTR_DURATION, 0), call.data[ATTR_TOP]):
+                    started.append(coordinator.profiler)
+        except HomeAssistantError:
+            # Python 3.12+ allows one profiler, so with several panels only one can be profiled at a time
+            for profiler in started:
+                profiler.async_cancel()
+            raise
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA)
+
+    async def async_export_trace(call: ServiceCall) -> ServiceResponse:
+        """Write traced spans to the config directory as Chrome trace json."""
+        panels = []
+        for coordinator in get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            path = hass.config.path(
+                f"{DOMAIN}_{coordinator.config_entry.data[CONF_PANEL_ID]}_trace_"
+                f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            spans = await hass.async_add_executor_job(coordinator.tracer.write, path)
+            _LOGGER.info("Trace of %s spans written to %s", spans, path)
+            panels.append({"panel": coordinator.config_entry.title, "path": path, "spans": spans})
+        return {"panels": panels}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TRACE,
+        async_export_trace,
+        schema=EXPORT_TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_run_benchmark(call: ServiceCall) -> ServiceResponse:
+        """Benchmark entity hot paths against the stored baseline."""
+        from .benchmark import async_benchmark  # pylint: disable=import-outside-toplevel
+
+        panels = [
+            await async_benchmark(coordinator, call.data[ATTR_SAVE_BASELINE], call.data[ATTR_THRESHOLD])
+            for coordinator in get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        ]
+        regressions = [regression["name"] for panel in panels for regression in panel["regressions"]]
+        if regressions and call.data[ATTR_FAIL_ON_REGRESSION]:
+            raise HomeAssistantError(f"Benchmarks slower than baseline: {', '.join(sorted(set(regressions)))}")
+        return {"panels": panels}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BENCHMARK,
+        async_run_benchmark,
+        schema=BENCHMARK_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_run_load_test(call: ServiceCall) -> ServiceResponse:
+        """Load test entity setup and refresh fan-out with synthetic panels and write results as json."""
+        from .loadtest import async_load_test  # pylint: disable=import-outside-toplevel
+
+        panels = []
+        for coordinator in get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            result = await async_load_test(coordinator, call.data[ATTR_REFRESHES])
+            path = hass.config.path(
+                f"{DOMAIN}_{coordinator.config_entry.data[CONF_PANEL_ID]}_load_test_"
+                f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            await hass.async_add_executor_job(write_json, path, result)
+            _LOGGER.info("Load test results written to %s", path)
+            panels.append({**result, "path": path})
+        return {"panels": panels}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LOAD_TEST,
+        async_run_load_test,
+        schema=LOAD_TEST_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_EVENTS,
+        async_get_events,
+        schema=GET_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def async_unload_services(hass: HomeAssistant):
+    """Remove services once the last config entry is unloaded."""
+    if hass.data.get(DOMAIN):
+        return
+    for service in [
+        SERVICE_ARM_PARTITIONS,
+        SERVICE_DISARM_PARTITIONS,
+        SERVICE_GET_EVENTS,
+        SERVICE_PROFILE,
+        SERVICE_BENCHMARK,
+        SERVICE_EXPORT_TRACE,
+        SERVICE_LOAD_TEST,
+    ]:
+        hass.services.async_remove(DOMAIN, service)
+
+
+async def async_action_partitions(hass: HomeAssistant, call: ServiceCall, action: AlarmAction) -> ServiceResponse:
+    """Action partitions across the targeted panels concurrently."""
+    targets = []
+    for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+        if call.data.get(ATTR_CONFIG_ENTRY_ID) not in [None, entry_id]:
+            continue
+
+        coordinator: VisonicAlarmCoordinator = entry_data[DATA]
+        alarms = entry_data.get(ALARM_PANELS, {})
+        partition_ids = call.data.get(ATTR_PARTITIONS, list(alarms))
+
+        # Validate pins up front so no panel is actioned if any pin is wrong
+        pin_required = coordinator.pin_required_disarm if action == AlarmAction.DISARM else coordinator.pin_required_arm
+        if pin_required and call.data.get(CONF_CODE) != coordinator.config_entry.data[CONF_CODE]:
+            raise HomeAssistantError(f"Pin is required to action panel {coordinator.config_entry.title}")
+
+        targets.append((coordinator, alarms, partition_ids))
+
+    if not targets:
+        raise HomeAssistantError("No Visonic alarm panels found to action")
+
+    results = await asyncio.gather(
+        *[
+            async_action_panel_partitions(coordinator, alarms, partition_ids, action)
+            for coordinator, alarms, partition_ids in targets
+        ]
+    )
+    return {"results": [result for panel_results in results for result in panel_results]}
+
+
+async def async_action_panel_partitions(
+    coordinator: VisonicAlarmCoordinator, alarms: dict, partition_ids: list[int], action: AlarmAction
+) -> list[dict]:
+    """Check readiness once, send all partition commands and track them together."""
+    results = {
+        partition_id: {
+            "panel": coordinator.config_entry.title,
+            "partition": partition_id,
+            "success": False,
+            "error": None,
+        }
+        for partition_id in partition_ids
+    }
+
+    for partition_id in partition_ids:
+        if partition_id not in alarms:
+            results[partition_id]["error"] = "Partition not found"
+
+    ready_alarms = [alarms[partition_id] for partition_id in partition_ids if partition_id in alarms]
+
+    if action != AlarmAction.DISARM:
+        # Single status fetch covers the ready check for every partition
+        if not await coordinator.async_update_status(max_age=coordinator.status_max_age):
+            for alarm in ready_alarms:
+                results[alarm.partition_id]["error"] = "Unable to get partition status"
+            ready_alarms = []
+        for alarm in list(ready_alarms):
+            partition_status = coordinator.get_partition_status_by_id(alarm.partition_id)
+            if not (partition_status and partition_status.ready):
+                results[alarm.partition_id]["error"] = "Partition is not in a ready state"
+                ready_alarms.remove(alarm)
+
+    if ready_alarms:
+        _LOGGER.debug(
+            "Sending %s to partitions %s", action, ", ".join(str(alarm.partition_id) for alarm in ready_alarms)
+        )
+        with coordinator.tracer.span(
+            f"execute.{action}",
+            "command",
+            root_sample_rate=1,
+            partitions=",".join(str(alarm.partition_id) for alarm in ready_alarms),
+        ):
+            # Send every command first so their processes are polled together
+            tokens = await asyncio.gather(
+                *[alarm.async_send_action(action) for alarm in ready_alarms], return_exceptions=True
+            )
+            sent = []
+            for alarm, token in zip(ready_alarms, tokens):
+                if isinstance(token, Exception):
+                    _LOGGER.error(
+                        "Unable to complete %s on partition %s.  Error is %s", action, alarm.partition_id, token
+                    )
+                    results[alarm.partition_id]["error"] = str(token)
+                else:
+                    sent.append((alarm, token))
+
+            outcomes = await coordinator.async_wait_for_processes(
+                [(token, alarm.partition_in_state(ACTION_TARGET_STATE[action])) for alarm, token in sent]
+            )
+            for (alarm, _), outcome in zip(sent, outcomes):
+                alarm.async_action_completed(action, outcome)
+                if outcome:
+                    results[alarm.partition_id]["success"] = True
+                else:
+                    results[alarm.partition_id]["error"] = "Command did not complete successfully"
+
+        await coordinator.async_request_update(status_only=True)
+
+    return list(results.values())
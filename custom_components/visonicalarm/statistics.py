@@ -0,0 +1,81 @@
+"""Rolling statistics of device readings"""
+
+import math
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from .const import STAT_MAX, STAT_MEAN, STAT_MIN, STAT_RATE, STATISTICS_BUCKETS
+
+
+def reading_timestamp(reading_date: str | None) -> float:
+    """Return timestamp of a reading date, or now if it has none."""
+    if reading_date:
+        try:
+            return datetime.strptime(reading_date, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return time.time()
+
+
+class RollingStatistic:
+    """Fixed memory rolling aggregates of one reading.
+
+    The mean is exponentially decayed with the window as its time constant.  Min
+    and max are kept per bucket and a window holds a fixed number of buckets, so
+    memory never grows.  Rate of change is per hour between the last two readings.
+    """
+
+    __slots__ = ("_window", "_bucket_size", "_buckets", "_last_time", "_last_value", "mean", "rate")
+
+    def __init__(self, window: float) -> None:
+        """Initialise statistic over window in seconds."""
+        self._window = window
+        self._bucket_size = window / STATISTICS_BUCKETS
+        self._buckets: deque[list[float]] = deque(maxlen=STATISTICS_BUCKETS + 1)
+        self._last_time: float | None = None
+        self._last_value: float | None = None
+        self.mean: float | None = None
+        self.rate: float | None = None
+
+    def add(self, timestamp: float, value: float) -> bool:
+        """Add reading.  Returns False if it is not newer than the last reading."""
+        if self._last_time is not None:
+            if timestamp <= self._last_time:
+                return False
+            elapsed = timestamp - self._last_time
+            self.mean += (1 - math.exp(-elapsed / self._window)) * (value - self.mean)
+            self.rate = (value - self._last_value) * 3600 / elapsed
+        else:
+            self.mean = value
+
+        bucket_start = timestamp - timestamp % self._bucket_size
+        if self._buckets and self._buckets[-1][0] == bucket_start:
+            bucket = self._buckets[-1]
+            bucket[1] = min(bucket[1], value)
+            bucket[2] = max(bucket[2], value)
+        else:
+            self._buckets.append([bucket_start, value, value])
+
+        self._last_time = timestamp
+        self._last_value = value
+        return True
+
+    def _window_buckets(self) -> list[list[float]]:
+        """Return buckets within the window of the last reading."""
+        return [bucket for bucket in self._buckets if bucket[0] > self._last_time - self._window - self._bucket_size]
+
+    @property
+    def min(self) -> float | None:
+        """Return min over window."""
+        return min((bucket[1] for bucket in self._window_buckets()), default=None) if self._buckets else None
+
+    @property
+    def max(self) -> float | None:
+        """Return max over window."""
+        return max((bucket[2] for bucket in self._window_buckets()), default=None) if self._buckets else None
+
+    def as_dict(self) -> dict[str, float | None]:
+        """Return statistics rounded for display."""
+        values = {STAT_MEAN: self.mean, STAT_MIN: self.min, STAT_MAX: self.max, STAT_RATE: self.rate}
+        return {key: round(value, 2) if value is not None else None for key, value in values.items()}
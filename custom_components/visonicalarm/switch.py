@@ -1,5 +1,5 @@
-import asyncio
 import logging
+import time
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.core import callback
@@ -33,12 +33,15 @@ SWITCHES = [
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the Visonic Alarm platform switches"""
     coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA]
+    start = time.perf_counter()
     switches = []
 
     # Device switches
     for device in coordinator.devices:
         if device and device.subtype and device.subtype in SUPPORTED_SENSORS:
             for switch in [switch for switch in SWITCHES if switch["type"] == "device"]:
+                if switch["name"] not in coordinator.zone_entities:
+                    continue
                 if hasattr(device, switch["name"]) and getattr(device, switch["name"]) is not None:
                     _LOGGER.debug("Adding %s switch for %s", switch["name"], BaseVisonicEntity.get_base_name(device))
                     switches.append(VisonicAlarmDeviceSwitch(coordinator, device, switch))
@@ -50,6 +53,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         switches.append(VisonicAlarmPanelSwitch(coordinator, switch))
 
     async_add_entities(switches)
+    coordinator.metrics.record_entity_setup("switch", len(switches), start)
 
 
 class VisonicAlarmSwitch(BaseVisonicEntity, CoordinatorEntity, SwitchEntity):
@@ -64,13 +68,6 @@ class VisonicAlarmSwitch(BaseVisonicEntity, CoordinatorEntity, SwitchEntity):
         self._switch_info = switch_info
         self._switch_type = switch_info["name"]
 
-    async def async_force_update(self, delay: int = 0):
-        """Force update from alarm panel."""
-        _LOGGER.debug("Alarm update initiated by %s", self.name)
-        if delay:
-            await asyncio.sleep(delay)
-        await self.coordinator.async_refresh()
-
     @property
     def is_on(self) -> bool | None:
         """Return if is on."""
@@ -113,13 +110,13 @@ class VisonicAlarmSwitch(BaseVisonicEntity, CoordinatorEntity, SwitchEntity):
             func = getattr(self._alarm, switch_info["function"])
 
         if switch_info.get("require_device_id"):
-            token = await self.hass.async_add_executor_job(
+            token = await self.coordinator.async_add_job(
                 func,
                 self._device.device_number,
                 state,
             )
         else:
-            token = await self.hass.async_add_executor_job(
+            token = await self.coordinator.async_add_job(
                 func,
             )
 
@@ -0,0 +1,90 @@
+"""Span tracing of refresh and command lifecycles"""
+
+import itertools
+import json
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+# Tracer and trace id of the trace the current task is part of
+_CURRENT_TRACE: ContextVar[tuple["VisonicTracer", int] | None] = ContextVar("visonicalarm_current_trace", default=None)
+
+
+class VisonicTracer:
+    """Record sampled spans in a bounded buffer for export as a Chrome trace.
+
+    A span started outside a trace is a root and is sampled at the given rate.
+    Spans started inside a trace, including in tasks it creates, are always
+    recorded as part of it.  Untraced spans cost a context variable lookup.
+    """
+
+    def __init__(self, name: str, size: int, sample_rate: float) -> None:
+        """Initialise tracer."""
+        self._name = name
+        self._spans: deque[tuple] = deque(maxlen=size)
+        self._trace_ids = itertools.count(1)
+        # Offset to convert perf_counter to wall clock for the export
+        self._wall_offset = time.time() - time.perf_counter()
+        self.sample_rate = sample_rate
+
+    def __len__(self) -> int:
+        """Return number of spans in buffer."""
+        return len(self._spans)
+
+    @contextmanager
+    def span(self, name: str, category: str, root_sample_rate: float | None = None, **args: Any) -> Iterator[None]:
+        """Record a span around the block.
+
+        Root spans are sampled at root_sample_rate, or the tracer's rate if not
+        given.  Use 0 for spans that are only wanted as part of a trace.
+        """
+        current = _CURRENT_TRACE.get()
+        token = None
+        if current and current[0] is self:
+            trace_id = current[1]
+        else:
+            sample_rate = self.sample_rate if root_sample_rate is None else root_sample_rate
+            if not sample_rate or random.random() >= sample_rate:
+                yield
+                return
+            trace_id = next(self._trace_ids)
+            token = _CURRENT_TRACE.set((self, trace_id))
+
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as ex:
+            args["error"] = type(ex).__name__
+            raise
+        finally:
+            self._spans.append((name, category, trace_id, start, time.perf_counter() - start, args))
+            if token:
+                _CURRENT_TRACE.reset(token)
+
+    def export(self) -> dict:
+        """Return spans in Chrome trace event format, loadable in Perfetto."""
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": self._name}}]
+        events.extend(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((start + self._wall_offset) * 1e6),
+                "dur": round(duration * 1e6),
+                "pid": 1,
+                "tid": trace_id,
+                "args": {key: str(value) for key, value in args.items()},
+            }
+            for name, category, trace_id, start, duration, args in self._spans
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> int:
+        """Write trace to path and return number of spans written.  Blocking."""
+        trace = self.export()
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(trace, file)
+        return len(trace["traceEvents"]) - 1
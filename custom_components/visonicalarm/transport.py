@@ -0,0 +1,185 @@
+"""Record and replay transport for the Visonic API"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any
+
+from pyvisonicalarm import classes as VisonicClasses
+from pyvisonicalarm import exceptions as VisonicExceptions
+from pyvisonicalarm.device_definitions import DEVICE_SUBTYPES, DEVICE_TYPES
+from pyvisonicalarm.devices import GenericDevice
+
+from .const import CAPTURE_MAX_BYTES
+from .diagnostics import ANON_KEYS
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+# Process tokens are kept, as replay matches command progress to commands by them and they expire in minutes
+REDACT_KEYS = [
+    *ANON_KEYS,
+    "panel_serial",
+    "session_token",
+    "user_token",
+    "email",
+    "password",
+    "user_code",
+]
+# Methods whose arguments are credentials or serials
+REDACT_ARGS = ["authenticate", "panel_login"]
+
+
+def redact(data: Any) -> Any:
+    """Redact sensitive keys from api data."""
+    if isinstance(data, dict):
+        return {key: REDACTED if key in REDACT_KEYS and value else redact(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [redact(item) for item in data]
+    return data
+
+
+def encode_result(result: Any) -> Any:
+    """Encode api result to json friendly data."""
+    if isinstance(result, list):
+        return [encode_result(item) for item in result]
+    if hasattr(result, "_data"):
+        return {"class": type(result).__name__, "data": redact(result._data)}  # pylint: disable=protected-access
+    return redact(result)
+
+
+def decode_result(result: Any) -> Any:
+    """Decode recorded result back to api classes."""
+    if isinstance(result, list):
+        return [decode_result(item) for item in result]
+    if isinstance(result, dict) and result.keys() == {"class", "data"}:
+        if hasattr(VisonicClasses, result["class"]):
+            return getattr(VisonicClasses, result["class"])(result["data"])
+        data = result["data"]
+        device_class = DEVICE_SUBTYPES.get(data.get("subtype")) or DEVICE_TYPES.get(data.get("device_type"))
+        return (device_class or GenericDevice)(data)
+    return result
+
+
+class RecordingAlarm:
+    """Proxy for the api that writes every call, response and timing to a jsonl capture.
+
+    Once the capture reaches the max size it is moved to a .1 file, replacing
+    any previous one, so a long recording keeps at most two files.
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        path: str,
+        prefix: str = "",
+        lock: threading.Lock | None = None,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+    ) -> None:
+        """Initialise recorder."""
+        self._target = target
+        self._path = path
+        self._prefix = prefix
+        self._lock = lock or threading.Lock()
+        self._max_bytes = max_bytes
+
+    @property
+    def target(self) -> Any:
+        """Return the object being recorded."""
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name == "api":
+            return RecordingAlarm(attr, self._path, "api.", self._lock, self._max_bytes)
+        if not callable(attr):
+            return attr
+
+        method = f"{self._prefix}{name}"
+
+        def record(*args):
+            record = {
+                "time": time.time(),
+                "method": method,
+                "args": [REDACTED] * len(args) if name in REDACT_ARGS else redact(list(args)),
+            }
+            start = time.perf_counter()
+            try:
+                result = attr(*args)
+                record["result"] = encode_result(result)
+                return result
+            except Exception as ex:
+                record["error"] = {"class": type(ex).__name__, "message": str(ex)}
+                raise
+            finally:
+                record["duration"] = time.perf_counter() - start
+                self._write(record)
+
+        record.__name__ = name
+        return record
+
+    def _write(self, record: dict):
+        """Append record to capture file, rotating it if full."""
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            try:
+                if os.path.getsize(self._path) + len(line) > self._max_bytes:
+                    os.replace(self._path, f"{self._path}.1")
+                    _LOGGER.info("Capture reached %s bytes, moved to %s.1", self._max_bytes, self._path)
+            except FileNotFoundError:
+                pass
+            with open(self._path, "a", encoding="utf-8") as file:
+                file.write(line)
+
+
+class ReplayAlarm:
+    """Stand in for the api that serves a capture back.
+
+    Responses are served per method in recorded order, so replay is deterministic
+    regardless of call arguments.  The last response of a method is repeated once
+    the capture is exhausted.  Speed scales recorded call durations, 0 for no delay.
+    """
+
+    def __init__(self, path: str, speed: float = 1, prefix: str = "", records: dict | None = None) -> None:
+        """Initialise replay."""
+        self._speed = speed
+        self._prefix = prefix
+        self._records: dict[str, deque] = records if records is not None else self._load(path)
+
+    @staticmethod
+    def _load(path: str) -> dict[str, deque]:
+        """Load capture grouped by method."""
+        records = defaultdict(deque)
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    records[record["method"]].append(record)
+        _LOGGER.debug("Loaded %s replay records from %s", sum(len(queue) for queue in records.values()), path)
+        return records
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "api":
+            return ReplayAlarm("", self._speed, "api.", self._records)
+
+        method = f"{self._prefix}{name}"
+
+        def replay(*_args):
+            queue = self._records.get(method)
+            if not queue:
+                raise VisonicExceptions.NotSupportedError(f"No recorded response for {method}")
+            record = queue.popleft() if len(queue) > 1 else queue[0]
+
+            if self._speed:
+                time.sleep(record.get("duration", 0) / self._speed)
+
+            if error := record.get("error"):
+                exception = getattr(VisonicExceptions, error["class"], VisonicExceptions.Error)
+                raise exception(error["message"])
+            return decode_result(record.get("result"))
+
+        replay.__name__ = name
+        return replay
@@ -0,0 +1,101 @@
+"""Websocket commands for Visonic Alarm"""
+
+from functools import partial
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import ATTR_CONFIG_ENTRY_ID, ATTR_END, ATTR_EVENT_TYPE, ATTR_LIMIT, ATTR_START, ATTR_ZONE, DOMAIN
+from .services import get_coordinators, query_events
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant):
+    """Register websocket commands."""
+    websocket_api.async_register_command(hass, websocket_get_events)
+    websocket_api.async_register_command(hass, websocket_get_snapshot)
+    websocket_api.async_register_command(hass, websocket_subscribe_snapshot)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/events",
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Optional(ATTR_ZONE): int,
+        vol.Optional(ATTR_EVENT_TYPE): str,
+        vol.Optional(ATTR_START): str,
+        vol.Optional(ATTR_END): str,
+        vol.Optional(ATTR_LIMIT, default=50): vol.All(int, vol.Range(min=1)),
+    }
+)
+@callback
+def websocket_get_events(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict):
+    """Return panel events from history."""
+    start = dt_util.parse_datetime(msg[ATTR_START]) if msg.get(ATTR_START) else None
+    end = dt_util.parse_datetime(msg[ATTR_END]) if msg.get(ATTR_END) else None
+
+    connection.send_result(
+        msg["id"],
+        {
+            "events": query_events(
+                hass,
+                msg.get(ATTR_CONFIG_ENTRY_ID),
+                zone=msg.get(ATTR_ZONE),
+                label=msg.get(ATTR_EVENT_TYPE),
+                start=start,
+                end=end,
+                limit=msg[ATTR_LIMIT],
+            )
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/snapshot",
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): str,
+    }
+)
+@callback
+def websocket_get_snapshot(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict):
+    """Return current status, partitions and devices of panels."""
+    coordinators = get_coordinators(hass, msg.get(ATTR_CONFIG_ENTRY_ID))
+    connection.send_result(msg["id"], {"panels": [coordinator.get_snapshot() for coordinator in coordinators]})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/snapshot/subscribe",
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): str,
+    }
+)
+@callback
+def websocket_subscribe_snapshot(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict):
+    """Send full snapshot of panels, then only what changed after each refresh."""
+    coordinators = get_coordinators(hass, msg.get(ATTR_CONFIG_ENTRY_ID))
+    snapshots = {coordinator.config_entry.entry_id: coordinator.get_snapshot() for coordinator in coordinators}
+
+    @callback
+    def async_send_delta(coordinator):
+        """Send changes since the last snapshot sent to this subscriber."""
+        entry_id = coordinator.config_entry.entry_id
+        snapshot = coordinator.get_snapshot()
+        delta = coordinator.get_snapshot_delta(snapshots[entry_id], snapshot)
+        snapshots[entry_id] = snapshot
+        connection.send_message(websocket_api.event_message(msg["id"], {"delta": delta}))
+
+    unsubscribers = [
+        coordinator.async_add_listener(partial(async_send_delta, coordinator)) for coordinator in coordinators
+    ]
+
+    @callback
+    def async_unsubscribe():
+        """Remove coordinator listeners."""
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"panels": list(snapshots.values())}))